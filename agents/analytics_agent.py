@@ -1,7 +1,8 @@
 # agents/analytics_agent.py
 
 from agents.base_agent import BaseAgent
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+from utils.food_lexicon import GROUPS
 from utils.personality import add_warmth
 
 
@@ -11,6 +12,7 @@ class AnalyticsAgent(BaseAgent):
     - Reviews logged history and summarizes engagement.
     - Tracks streaks and assigns achievement badges.
     - Adapts encouragement to user profile traits.
+    - Folds in rollups of archived (cold) logs so totals and streaks stay exact.
     """
 
     def __init__(self, memory, llm=None):
@@ -29,6 +31,8 @@ class AnalyticsAgent(BaseAgent):
 
         for entry in sorted_logs[1:]:
             entry_date = datetime.fromisoformat(entry["timestamp"]).date()
+            if entry_date == last_date:
+                continue  # several logs on one day count once
             if entry_date == last_date - timedelta(days=1):
                 streak += 1
                 last_date = entry_date
@@ -37,6 +41,31 @@ class AnalyticsAgent(BaseAgent):
 
         return streak
 
+    def extend_with_archive(self, logs: list, streak: int, archived: dict) -> int:
+        """Continue a hot-log streak into the archived run that ends the day before the oldest hot log."""
+        run = archived.get("streak")
+        if not run:
+            return streak
+        if not logs:
+            return run["length"]
+
+        days = {datetime.fromisoformat(e["timestamp"]).date() for e in logs}
+        oldest = min(days)
+        if streak == len(days) and date.fromisoformat(run["last_day"]) == oldest - timedelta(days=1):
+            return streak + run["length"]
+        return streak
+
+    def longest_streak(self, entries) -> int:
+        """Longest run of consecutive logging days over an oldest → newest stream of entries."""
+        longest, run, last_day = 0, 0, None
+        for entry in entries:
+            day = datetime.fromisoformat(entry["timestamp"]).date()
+            if day == last_day:
+                continue
+            run = run + 1 if last_day and day == last_day + timedelta(days=1) else 1
+            longest, last_day = max(longest, run), day
+        return longest
+
     def reward_badge(self, best_streak: int) -> str:
         """Generate badge label matching streak difficulty."""
         if best_streak >= 30:
@@ -49,24 +78,58 @@ class AnalyticsAgent(BaseAgent):
             return "✨ Habit Starter Badge (3+ days)"
         return "🌱 First Steps — proud of your progress!"
 
+    # ---------- Nutrition Aggregates ---------- #
+
+    def food_group_stats(self, meals: list, archived: dict = None) -> dict:
+        """Count meals containing each food group, from the structured fields stored at log time."""
+        archived = archived or {}
+        parsed = [m for m in meals if "food_groups" in m]
+        counts = {group: archived.get("meals_with_group", {}).get(group, 0) for group in GROUPS}
+        for meal in parsed:
+            for group in meal["food_groups"]:
+                counts[group] = counts.get(group, 0) + 1
+        return {"meals_parsed": len(parsed) + archived.get("meals_parsed", 0), "meals_with_group": counts}
+
+    def mood_trend(self, moods: list, window: int = 7) -> dict:
+        """Average valence of the latest check-ins vs. the ones before them."""
+        scored = [m["valence"] for m in moods if m.get("valence") is not None]
+        recent, previous = scored[-window:], scored[-2 * window:-window]
+        average = lambda values: round(sum(values) / len(values), 3) if values else None
+        return {"recent_avg_valence": average(recent), "previous_avg_valence": average(previous)}
+
     # ---------- Main Execution ---------- #
 
     def handle(self, user_id: str, message: str, context: dict = None) -> dict:
         user = self.memory.get_user(user_id)
         profile = user["profile"]
         logs = user["logs"]
+        archived = user.get("archived", {})
 
         workouts = logs.get("workouts", [])
         meals = logs.get("meals", [])
         moods = logs.get("mood", [])
 
+        total_workouts = len(workouts) + archived.get("workouts", {}).get("count", 0)
+        total_meals = len(meals) + archived.get("meals", {}).get("count", 0)
+        total_moods = len(moods) + archived.get("mood", {}).get("count", 0)
+
         # Compute streaks
-        workout_streak = self.calculate_streak(workouts)
-        meal_streak = self.calculate_streak(meals)
-        mood_streak = self.calculate_streak(moods)
+        workout_streak = self.extend_with_archive(workouts, self.calculate_streak(workouts), archived.get("workouts", {}))
+        meal_streak = self.extend_with_archive(meals, self.calculate_streak(meals), archived.get("meals", {}))
+        mood_streak = self.extend_with_archive(moods, self.calculate_streak(moods), archived.get("mood", {}))
 
         best_streak = max(workout_streak, meal_streak, mood_streak)
         badge = self.reward_badge(best_streak)
+        nutrition = self.food_group_stats(meals, archived.get("meals"))
+        mood_trend = self.mood_trend(moods)
+
+        # All-time records need the archived entries — only read them when asked for
+        all_time_best = None
+        if any(word in message.lower() for word in ("all time", "all-time", "history", "longest")):
+            all_time_best = max(
+                self.longest_streak(self.memory.iter_logs(user_id, category))
+                for category in ("workouts", "meals", "mood")
+            )
 
         # Personal tone
         name = profile.get("name") or "friend"
@@ -94,14 +157,17 @@ class AnalyticsAgent(BaseAgent):
                 "goal": goal
             },
             "stats": {
-                "total_workouts": len(workouts),
-                "total_meals_logged": len(meals),
-                "total_mood_checkins": len(moods),
+                "total_workouts": total_workouts,
+                "total_meals_logged": total_meals,
+                "total_mood_checkins": total_moods,
                 "streaks": {
                     "workout_streak_days": workout_streak,
                     "meal_streak_days": meal_streak,
-                    "mood_streak_days": mood_streak
-                }
+                    "mood_streak_days": mood_streak,
+                    "all_time_best_days": all_time_best
+                },
+                "nutrition": nutrition,
+                "mood_trend": mood_trend
             },
             "badge": badge,
             "encouragement": encouragement,
@@ -114,10 +180,13 @@ class AnalyticsAgent(BaseAgent):
         # Create friendly user-facing message
         display_text = (
             f"📊 **Progress Summary for {name}**\n\n"
-            f"🏋️ Workouts logged: **{len(workouts)}**\n"
-            f"🥗 Meals logged: **{len(meals)}**\n"
-            f"🧠 Mood check-ins: **{len(moods)}**\n\n"
+            f"🏋️ Workouts logged: **{total_workouts}**\n"
+            f"🥗 Meals logged: **{total_meals}**\n"
+            f"🧠 Mood check-ins: **{total_moods}**\n"
+            f"🥦 Meals with vegetables: **{nutrition['meals_with_group']['vegetables']}**"
+            f" · with protein: **{nutrition['meals_with_group']['protein']}**\n\n"
             f"🔥 Best streak: **{best_streak} days**\n"
+            + (f"🏆 All-time best streak: **{all_time_best} days**\n" if all_time_best else "") +
             f"🏅 Badge earned: **{badge}**\n\n"
             f"{encouragement}\n\n"
             f"🎯 Next micro-goal:\n➡ {summary['next_micro_goal']}"
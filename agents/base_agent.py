@@ -2,12 +2,32 @@
 
 from memory.memory_service import MemoryService
 from tools.gemini_client import GeminiClient
+from utils.admission_control import AdmissionController
 
 class BaseAgent:
     def __init__(self, memory: MemoryService, llm: GeminiClient | None, name: str):
         self.memory = memory
         self.llm = llm
         self.name = name
+        self.admission: AdmissionController | None = None  # set by the Orchestrator when enabled
 
     def handle(self, user_id: str, message: str, context: dict) -> dict:
         raise NotImplementedError("Subclasses must implement handle()")
+
+    def admit(self) -> bool:
+        """False when the system is overloaded and the local fallback should be served instead of the LLM."""
+        return self.admission is None or self.admission.admit(self.name)
+
+    def release_admission(self) -> None:
+        """Hand back the slot admit() reserved if the LLM ended up not being called."""
+        if self.admission is not None:
+            self.admission.release()
+
+    def generate(self, system_prompt: str, user_prompt: str) -> str:
+        """LLM call, measured by the admission controller when one is set."""
+        if not self.llm:
+            return ""
+        if self.admission is None:
+            return self.llm.generate(system_prompt, user_prompt)
+        with self.admission.track():
+            return self.llm.generate(system_prompt, user_prompt)
@@ -2,32 +2,112 @@
 
 from datetime import datetime
 import json
+import time
 from agents.base_agent import BaseAgent
+from services.plan_pregenerator import PlanPregenerator
 from utils.personality import add_warmth
+from utils.serve_stats import ServeStats
+from utils.tracing import trace_span, annotate_root
+from utils.workout_composer import parse_request, compose
+
+
+RECENT_WORKOUTS = 3  # plans the composer varies against
 
 
 class FitnessAgent(BaseAgent):
     """
     Fitness Coach Agent:
-    - Generates safe, beginner-friendly workouts using Gemini.
+    - Composes common workouts locally from the exercise library (no LLM).
+    - Serves plans pre-generated off-peak for users with a daily habit (when enabled).
+    - Generates safe, beginner-friendly workouts using Gemini for free-form requests.
     - Adapts tone based on profile (age, gender, fitness level).
-    - Includes fallback plan if LLM doesn't return valid JSON.
+    - Includes fallback plan if LLM doesn't return valid JSON, or when load is shed.
     """
 
     def __init__(self, memory, llm):
         super().__init__(memory, llm, "fitness_agent")
+        self.serve_stats = ServeStats(self.name)
+        self.pregenerated = PlanPregenerator.from_env(memory.db)
 
     def handle(self, user_id: str, message: str, context: dict) -> dict:
 
         user = self.memory.get_user(user_id)
         profile = user["profile"]
+        past_workouts = user["logs"].get("workouts", [])
 
         name = profile.get("name") or "friend"
-        age = profile.get("age")
         fitness_level = profile.get("fitness_level") or "beginner"
         equipment = profile.get("equipment", [])
         minutes = context.get("minutes", 20)
 
+        # --------- Local Composer --------- #
+
+        started = time.perf_counter()
+        workout = None
+        request = parse_request(message)
+        normalized = " ".join(message.lower().split())
+
+        if request is not None:
+            recent = [n for entry in past_workouts[-RECENT_WORKOUTS:] for n in entry.get("exercises", [])]
+            with trace_span("fitness.compose", focus=request["focus"]):
+                workout = compose(minutes, fitness_level, equipment, request, recent,
+                                  seed=f"{user_id}:{len(past_workouts)}")
+
+        if workout is not None:
+            exercises = workout.pop("exercises")
+            source = "local"
+            self.serve_stats.record_local((time.perf_counter() - started) * 1000)
+            annotate_root(served_locally=True)
+        elif self.pregenerated and (plan := self.pregenerated.claim(user_id, normalized, minutes)):
+            exercises = []
+            workout, source = plan, "precomputed"
+            self.serve_stats.record_local((time.perf_counter() - started) * 1000)
+            annotate_root(served_locally=True, precomputed=True)
+        elif not self.admit():
+            exercises = []
+            workout, source = self._fallback_workout(minutes, fitness_level), "shed"
+            self.serve_stats.record_shed()
+            annotate_root(shed=True)
+        else:
+            exercises = []
+            try:
+                workout, source = self._generate_with_llm(message, profile, minutes)
+            finally:
+                self.release_admission()
+            self.serve_stats.record_llm((time.perf_counter() - started) * 1000)
+
+        # --------- Save workout log --------- #
+        self.memory.append_log(user_id, "workouts", {
+            "timestamp": datetime.utcnow().isoformat(),
+            "plan": workout,
+            "source": source,
+            "minutes": minutes,
+            "request": normalized,
+            "exercises": exercises
+        })
+
+        # --------- Prepare Friendly UI Output --------- #
+
+        display_text = (
+            f"🏋️ Workout Ready for **{name}!**\n\n"
+            f"⏱ Duration: **{workout['duration']}**\n"
+            f"🔥 Intensity: **{workout['intensity']}**\n\n"
+            f"📋 Steps:\n" + "\n".join([f"• {step}" for step in workout["steps"]]) +
+            f"\n\n✨ Tip:\n➡ {workout['tips']}"
+        )
+
+        workout["display"] = add_warmth(display_text)
+
+        return workout
+
+    def _generate_with_llm(self, message: str, profile: dict, minutes: int) -> tuple[dict, str]:
+        """Free-form requests: ask Gemini. Returns (plan, "llm" | "fallback")."""
+
+        name = profile.get("name") or "friend"
+        age = profile.get("age")
+        fitness_level = profile.get("fitness_level") or "beginner"
+        equipment = profile.get("equipment", [])
+
         # --------- Personalized Tone Context --------- #
 
         if age and age < 18:
@@ -74,44 +154,34 @@ class FitnessAgent(BaseAgent):
         # --------- Attempt LLM --------- #
 
         try:
-            generated = self.llm.generate(system_prompt, user_prompt) if self.llm else ""
+            generated = self.generate(system_prompt, user_prompt)
         except:
             generated = ""
 
-        try:
-            workout = json.loads(generated)
-        except:
-            workout = {
-                "workout_name": "Quick Full-Body Routine",
-                "duration": f"{minutes} minutes",
-                "intensity": fitness_level,
-                "steps": [
-                    "Warm-up: march in place — 2 minutes",
-                    "10 bodyweight squats",
-                    "10 push-ups (knees ok)",
-                    "20 jumping jacks",
-                    "Rest 1 minute, repeat sequence twice",
-                    "Finish: light stretching — 5 minutes"
-                ],
-                "tips": "Move at a comfortable pace. Hydrate and take pauses if needed."
-            }
-
-        # --------- Save workout log --------- #
-        self.memory.append_log(user_id, "workouts", {
-            "timestamp": datetime.utcnow().isoformat(),
-            "plan": workout
-        })
-
-        # --------- Prepare Friendly UI Output --------- #
-
-        display_text = (
-            f"🏋️ Workout Ready for **{name}!**\n\n"
-            f"⏱ Duration: **{workout['duration']}**\n"
-            f"🔥 Intensity: **{workout['intensity']}**\n\n"
-            f"📋 Steps:\n" + "\n".join([f"• {step}" for step in workout["steps"]]) +
-            f"\n\n✨ Tip:\n➡ {workout['tips']}"
-        )
-
-        workout["display"] = add_warmth(display_text)
-
-        return workout
+        with trace_span("agent.parse_json", agent=self.name) as span:
+            try:
+                workout = json.loads(generated)
+                source = "llm"
+            except:
+                source = "fallback"
+                span.set(fallback=True)
+                annotate_root(fallback=True)
+                workout = self._fallback_workout(minutes, fitness_level)
+
+        return workout, source
+
+    def _fallback_workout(self, minutes: int, fitness_level: str) -> dict:
+        return {
+            "workout_name": "Quick Full-Body Routine",
+            "duration": f"{minutes} minutes",
+            "intensity": fitness_level,
+            "steps": [
+                "Warm-up: march in place — 2 minutes",
+                "10 bodyweight squats",
+                "10 push-ups (knees ok)",
+                "20 jumping jacks",
+                "Rest 1 minute, repeat sequence twice",
+                "Finish: light stretching — 5 minutes"
+            ],
+            "tips": "Move at a comfortable pace. Hydrate and take pauses if needed."
+        }
@@ -2,8 +2,41 @@
 
 from datetime import datetime
 import json
+import random
+import time
 from agents.base_agent import BaseAgent
+from utils.mood_scorer import score_mood
+from utils.note_index import NoteIndex
 from utils.personality import add_warmth
+from utils.serve_stats import ServeStats
+from utils.tracing import trace_span, annotate_root
+
+
+ROUTINE_MAX_AROUSAL = 0.6  # neutral and calm-ish check-ins are answered locally
+ROUTINE_EMOTIONS = {"calm"}  # every matched word must be one of these — no hits is not "neutral"
+RECALL_K = 3               # similar past notes considered for the prompt
+RECALL_TOKEN_BUDGET = 120  # cap on how much of the prompt recalled notes may take
+
+ROUTINE_REPLIES = [
+    {
+        "mood_acknowledgement": "Thanks for checking in, {name}. A steady, in-between kind of day is worth noticing too.",
+        "journal_prompt": "What is one small thing that went okay today?",
+        "optional_breathing_or_grounding": "Notice three things you can see and one thing you can hear, slowly.",
+        "supportive_message": "Regular check-ins like this build real self-awareness — nice work."
+    },
+    {
+        "mood_acknowledgement": "Good to hear from you, {name}. Feeling fairly neutral is a perfectly fine place to be.",
+        "journal_prompt": "If today had a color, what would it be — and why?",
+        "optional_breathing_or_grounding": "Roll your shoulders back twice and let your breath settle on its own.",
+        "supportive_message": "Showing up for yourself, even on ordinary days, is what makes habits stick."
+    },
+    {
+        "mood_acknowledgement": "Thanks for the update, {name}. Calm and ordinary moments count.",
+        "journal_prompt": "What would make the rest of today feel a little lighter?",
+        "optional_breathing_or_grounding": "Try one breath in for 4 seconds and out for 6.",
+        "supportive_message": "You're building a kind habit of checking in with yourself."
+    },
+]
 
 
 class MindfulnessAgent(BaseAgent):
@@ -11,27 +44,86 @@ class MindfulnessAgent(BaseAgent):
     Mindfulness Agent:
     - Responds with supportive emotional reflection.
     - Avoids clinical language, advice, or diagnosis.
-    - Logs user's emotional state and provides gentle guidance.
+    - Logs user's emotional state (label + numeric valence / arousal).
+    - Answers routine neutral check-ins locally, without the LLM.
+    - Recalls similar past notes from a local index to personalise replies.
     """
 
     def __init__(self, memory, llm):
         super().__init__(memory, llm, "mindfulness_agent")
+        self.serve_stats = ServeStats(self.name)
+        self.notes = NoteIndex(memory.db)
 
     def handle(self, user_id: str, message: str, context: dict) -> dict:
 
         user = self.memory.get_user(user_id)
         profile = user["profile"]
 
-        mood = context.get("mood", "unknown")
         note = context.get("note", message)
+        score = score_mood(note) if "valence" not in context else context
+        mood = context.get("mood", score["mood"])
 
         # Log entry
+        timestamp = datetime.utcnow().isoformat()
         self.memory.append_log(user_id, "mood", {
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": timestamp,
             "mood": mood,
-            "note": note
+            "note": note,
+            "valence": score["valence"],
+            "arousal": score["arousal"],
+            "emotion": score.get("emotion")
         })
 
+        name = profile.get("name") or "friend"
+
+        # ----- Routine Check-Ins -----
+        started = time.perf_counter()
+        if self._is_routine(mood, score):
+            template = random.choice(ROUTINE_REPLIES)
+            parsed = {key: text.format(name=name) for key, text in template.items()}
+            self.serve_stats.record_local((time.perf_counter() - started) * 1000)
+            annotate_root(served_locally=True)
+        elif not self.admit():
+            parsed = self._fallback_reply(name, mood)
+            self.serve_stats.record_shed()
+            annotate_root(shed=True)
+        else:
+            try:
+                with trace_span("notes.search", agent=self.name):
+                    similar = self.notes.search(user_id, note, k=RECALL_K)
+                parsed = self._reply_with_llm(profile, mood, note, similar)
+            finally:
+                self.release_admission()
+            self.serve_stats.record_llm((time.perf_counter() - started) * 1000)
+
+        # Index after searching, so a note never recalls itself
+        self.notes.add(user_id, note, timestamp, mood)
+
+        # ----- Create UI-Friendly Output -----
+        display_text = (
+            f"🧘 **Mindfulness Check-In**\n\n"
+            f"💬 {parsed['mood_acknowledgement']}\n\n"
+            f"🪷 Quick grounding suggestion:\n➡ {parsed['optional_breathing_or_grounding']}\n\n"
+            f"📓 Journal prompt:\n➡ *{parsed['journal_prompt']}*\n\n"
+            f"💛 {parsed['supportive_message']}"
+        )
+
+        parsed["display"] = add_warmth(display_text)
+
+        return parsed
+
+    def _is_routine(self, mood: str, score: dict) -> bool:
+        """Templates only for check-ins the lexicon positively recognised as calm and neutral."""
+        emotions = score.get("emotions", [])
+        return (
+            mood == "neutral"
+            and score.get("matched", 0) > 0
+            and score["arousal"] < ROUTINE_MAX_AROUSAL
+            and all(e in ROUTINE_EMOTIONS for e in emotions)
+        )
+
+    def _reply_with_llm(self, profile: dict, mood: str, note: str, similar: list = None) -> dict:
+
         # Personal details
         name = profile.get("name") or "friend"
         age = profile.get("age")
@@ -77,37 +169,39 @@ class MindfulnessAgent(BaseAgent):
         Message: "{note}"
         """
 
+        recalled = NoteIndex.prompt_context(similar or [], RECALL_TOKEN_BUDGET)
+        if recalled:
+            user_prompt += f"""
+        Similar past check-ins (mention gently only if it helps, e.g. what helped last time):
+        {recalled}
+        """
+
         # ----- LLM Execution -----
         try:
-            generated = self.llm.generate(system_prompt, user_prompt) if self.llm else ""
+            generated = self.generate(system_prompt, user_prompt)
         except:
             generated = ""
 
         # ----- Parse Output -----
-        try:
-            parsed = json.loads(generated)
-        except:
-            parsed = {
-                "mood_acknowledgement": f"I hear you, {name}. Feeling {mood} is completely valid.",
-                "journal_prompt": "If it feels okay, write one short sentence describing what you need right now.",
-                "optional_breathing_or_grounding": (
-                    "You can pause for a single slow breath: inhale 4 seconds, exhale longer than the inhale."
-                ),
-                "supportive_message": (
-                    "Checking in with how you feel is already a meaningful step. "
-                    "You're doing your best — and that is enough for now."
-                )
-            }
-
-        # ----- Create UI-Friendly Output -----
-        display_text = (
-            f"🧘 **Mindfulness Check-In**\n\n"
-            f"💬 {parsed['mood_acknowledgement']}\n\n"
-            f"🪷 Quick grounding suggestion:\n➡ {parsed['optional_breathing_or_grounding']}\n\n"
-            f"📓 Journal prompt:\n➡ *{parsed['journal_prompt']}*\n\n"
-            f"💛 {parsed['supportive_message']}"
-        )
-
-        parsed["display"] = add_warmth(display_text)
+        with trace_span("agent.parse_json", agent=self.name) as span:
+            try:
+                parsed = json.loads(generated)
+            except:
+                span.set(fallback=True)
+                annotate_root(fallback=True)
+                parsed = self._fallback_reply(name, mood)
 
         return parsed
+
+    def _fallback_reply(self, name: str, mood: str) -> dict:
+        return {
+            "mood_acknowledgement": f"I hear you, {name}. Feeling {mood} is completely valid.",
+            "journal_prompt": "If it feels okay, write one short sentence describing what you need right now.",
+            "optional_breathing_or_grounding": (
+                "You can pause for a single slow breath: inhale 4 seconds, exhale longer than the inhale."
+            ),
+            "supportive_message": (
+                "Checking in with how you feel is already a meaningful step. "
+                "You're doing your best — and that is enough for now."
+            )
+        }
@@ -2,20 +2,27 @@
 
 from datetime import datetime
 import json
+import time
 from agents.base_agent import BaseAgent
+from utils.food_lexicon import parse_meal, suggest, nutrition_type
 from utils.personality import add_warmth
+from utils.serve_stats import ServeStats
+from utils.tracing import trace_span, annotate_root
 
 
 class NutritionAgent(BaseAgent):
     """
     Nutrition Agent:
     - Logs meals and encourages gentle improvements.
+    - Parses meals into items and food groups with the local food lexicon.
+    - Serves templated suggestions locally when the parse is confident.
     - Uses profile data to tailor tone and suggestions.
     - Avoids calorie estimates, rules, or medical advice.
     """
 
     def __init__(self, memory, llm):
         super().__init__(memory, llm, "nutrition_agent")
+        self.serve_stats = ServeStats(self.name)
 
     def handle(self, user_id: str, message: str, context: dict) -> dict:
 
@@ -25,13 +32,59 @@ class NutritionAgent(BaseAgent):
 
         meal_desc = context.get("meal_description", message)
 
-        # Store meal entry
+        with trace_span("nutrition.parse_meal"):
+            parsed = parse_meal(meal_desc)
+
+        # Store meal entry (structured fields let analytics skip re-reading text)
         self.memory.append_log(user_id, "meals", {
             "timestamp": datetime.utcnow().isoformat(),
             "meal": meal_desc,
-            "estimated_calories": None
+            "estimated_calories": None,
+            "items": parsed["items"],
+            "food_groups": parsed["food_groups"],
+            "parse_confidence": parsed["confidence"]
         })
 
+        name = profile.get("name") or "friend"
+        diet = profile.get("diet_type")
+
+        # ---------------------- Local Suggestion ---------------------- #
+        # Templates assume no dietary preference; other diets keep the LLM's nuance.
+        started = time.perf_counter()
+        local_suggestion = suggest(parsed, name) if not diet or diet == "general" else None
+
+        if local_suggestion:
+            structured = {
+                "meal_log_entry": meal_desc,
+                "estimated_calories": None,
+                "nutrition_type": nutrition_type(parsed["food_groups"]),
+                "suggested_improvement": local_suggestion
+            }
+            self.serve_stats.record_local((time.perf_counter() - started) * 1000)
+            annotate_root(served_locally=True)
+        elif not self.admit():
+            structured = self._fallback_suggestion(meal_desc, name, diet)
+            self.serve_stats.record_shed()
+            annotate_root(shed=True)
+        else:
+            try:
+                structured = self._suggest_with_llm(meal_desc, profile)
+            finally:
+                self.release_admission()
+            self.serve_stats.record_llm((time.perf_counter() - started) * 1000)
+
+        # ------- Create Friendly Display Text ------- #
+        display_text = (
+            f"🥗 Meal logged: **{structured['meal_log_entry']}**\n\n"
+            f"💡 Suggested improvement:\n➡ {structured['suggested_improvement']}"
+        )
+
+        structured["display"] = add_warmth(display_text)
+
+        return structured
+
+    def _suggest_with_llm(self, meal_desc: str, profile: dict) -> dict:
+
         # ---------------------- Personalization ---------------------- #
         name = profile.get("name") or "friend"
         age = profile.get("age")
@@ -86,31 +139,29 @@ class NutritionAgent(BaseAgent):
 
         # Attempt LLM response
         try:
-            generated = self.llm.generate(system_prompt, user_prompt) if self.llm else ""
+            generated = self.generate(system_prompt, user_prompt)
         except:
             generated = ""
 
         # Parse → or fallback
-        try:
-            structured = json.loads(generated)
-        except:
-            structured = {
-                "meal_log_entry": meal_desc,
-                "estimated_calories": None,
-                "nutrition_type": diet or "general",
-                "suggested_improvement": (
-                    f"Nice job logging your meal, {name} 🌿. "
-                    f"If you want a tiny improvement, consider adding a vegetable, fruit, "
-                    f"or a glass of water to balance it."
-                )
-            }
-
-        # ------- Create Friendly Display Text ------- #
-        display_text = (
-            f"🥗 Meal logged: **{structured['meal_log_entry']}**\n\n"
-            f"💡 Suggested improvement:\n➡ {structured['suggested_improvement']}"
-        )
-
-        structured["display"] = add_warmth(display_text)
+        with trace_span("agent.parse_json", agent=self.name) as span:
+            try:
+                structured = json.loads(generated)
+            except:
+                span.set(fallback=True)
+                annotate_root(fallback=True)
+                structured = self._fallback_suggestion(meal_desc, name, diet)
 
         return structured
+
+    def _fallback_suggestion(self, meal_desc: str, name: str, diet: str | None) -> dict:
+        return {
+            "meal_log_entry": meal_desc,
+            "estimated_calories": None,
+            "nutrition_type": diet or "general",
+            "suggested_improvement": (
+                f"Nice job logging your meal, {name} 🌿. "
+                f"If you want a tiny improvement, consider adding a vegetable, fruit, "
+                f"or a glass of water to balance it."
+            )
+        }
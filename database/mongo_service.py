@@ -5,11 +5,11 @@ import os
 
 
 class MongoService:
-    def __init__(self):
+    def __init__(self, uri: str = None, db_name: str = None):
         load_dotenv()
 
-        uri = os.getenv("MONGO_URI")
-        db_name = os.getenv("DB_NAME")
+        uri = uri or os.getenv("MONGO_URI")
+        db_name = db_name or os.getenv("DB_NAME")
 
         print("🔗 Connecting to MongoDB...")
 
@@ -1,6 +1,7 @@
 # main.py
 
 import re
+from datetime import datetime
 from memory.memory_service import MemoryService
 from tools.gemini_client import GeminiClient
 
@@ -10,14 +11,21 @@ from agents.mindfulness_agent import MindfulnessAgent
 from agents.analytics_agent import AnalyticsAgent
 
 from services.auth_service import AuthService
+from tools.session_recorder import SessionRecorder
+from utils.admission_control import AdmissionController
+from utils.mood_scorer import score_mood
+from utils.tracing import trace_span
 
 
 
 class Orchestrator:
-    def __init__(self):
-        self.memory = MemoryService()
-        self.llm = GeminiClient()
-        self.auth = AuthService(self.memory)
+    def __init__(self, memory: MemoryService = None, llm=None, auth=None, admission: AdmissionController = None):
+        # Dependencies can be injected (replay harness, local stand-ins)
+        self.memory = memory or MemoryService()
+        self.llm = llm or GeminiClient()
+        self.auth = auth or AuthService(self.memory)
+        self.recorder = SessionRecorder.from_env()
+        self.admission = admission or AdmissionController.from_env()
 
         # Agents
         self.fitness_agent = FitnessAgent(self.memory, self.llm)
@@ -25,9 +33,18 @@ class Orchestrator:
         self.mindfulness_agent = MindfulnessAgent(self.memory, self.llm)
         self.analytics_agent = AnalyticsAgent(self.memory, None)
 
+        for agent in (self.fitness_agent, self.nutrition_agent, self.mindfulness_agent):
+            agent.admission = self.admission
+
     # ---------------- Onboarding ---------------- #
 
     def onboarding(self, email: str, message: str):
+        with trace_span("orchestrator.onboarding") as span:
+            response = self._onboarding_step(email, message)
+            span.set(handled=response is not None)
+            return response
+
+    def _onboarding_step(self, email: str, message: str):
         user = self.memory.get_user(email)
         profile = user["profile"]
         status = user.get("onboarding_status", {"step": 0, "completed": False})
@@ -86,6 +103,12 @@ class Orchestrator:
     # ---------------- Intent Detection ---------------- #
 
     def detect_intent(self, msg: str) -> str:
+        with trace_span("orchestrator.detect_intent") as span:
+            intent = self._match_intent(msg)
+            span.set(intent=intent)
+            return intent
+
+    def _match_intent(self, msg: str) -> str:
         msg = msg.lower()
 
         rules = {
@@ -104,6 +127,22 @@ class Orchestrator:
     # ---------------- Route Requests ---------------- #
 
     def handle(self, email: str, message: str) -> dict:
+        received_at = datetime.utcnow()
+
+        onboarding_step = None
+        if self.recorder:
+            status = self.memory.get_user(email).get("onboarding_status", {})
+            onboarding_step = None if status.get("completed") else status.get("step", 0)
+
+        with trace_span("orchestrator.handle", message_length=len(message)) as span:
+            reply = self._route(email, message)
+            span.set(agent=reply.get("agent"))
+
+        if self.recorder:
+            self.recorder.record(email, message, reply, received_at, onboarding_step)
+        return reply
+
+    def _route(self, email: str, message: str) -> dict:
 
         onboarding_response = self.onboarding(email, message)
         if onboarding_response:
@@ -116,28 +155,47 @@ class Orchestrator:
             match = re.search(r'\d+', message)
             if match:
                 ctx["minutes"] = int(match.group(0))
-            return {"agent": "fitness", "data": self.fitness_agent.handle(email, message, ctx)}
+            with trace_span("agent.handle", agent=self.fitness_agent.name):
+                return {"agent": "fitness", "data": self.fitness_agent.handle(email, message, ctx)}
 
         if intent == "nutrition":
             cleaned = message.lower().replace("i ate", "").strip()
             ctx["meal_description"] = cleaned
-            return {"agent": "nutrition", "data": self.nutrition_agent.handle(email, cleaned, ctx)}
+            with trace_span("agent.handle", agent=self.nutrition_agent.name):
+                return {"agent": "nutrition", "data": self.nutrition_agent.handle(email, cleaned, ctx)}
 
         if intent == "mindfulness":
-            mood = "neutral"
-            if any(w in message.lower() for w in ["sad", "stressed", "bad"]): mood = "low"
-            if any(w in message.lower() for w in ["happy", "great"]): mood = "high"
-            ctx["mood"] = mood
-            return {"agent": "mindfulness", "data": self.mindfulness_agent.handle(email, message, ctx)}
+            with trace_span("orchestrator.score_mood"):
+                score = score_mood(message)
+            ctx["mood"] = score["mood"]
+            ctx["valence"] = score["valence"]
+            ctx["arousal"] = score["arousal"]
+            ctx["emotion"] = score["emotion"]
+            ctx["emotions"] = score["emotions"]
+            ctx["matched"] = score["matched"]
+            with trace_span("agent.handle", agent=self.mindfulness_agent.name):
+                return {"agent": "mindfulness", "data": self.mindfulness_agent.handle(email, message, ctx)}
 
         if intent == "analytics":
-            return {"agent": "analytics", "data": self.analytics_agent.handle(email, message, ctx)}
+            with trace_span("agent.handle", agent=self.analytics_agent.name):
+                return {"agent": "analytics", "data": self.analytics_agent.handle(email, message, ctx)}
 
         return {
             "agent": "system",
             "message": "Hmm... I didn’t catch that 🤔\nTry:\n• “I ate pasta”\n• “Give me a workout”\n• “I feel stressed”\n• “Show stats”"
         }
 
+    # ---------------- Local Serving Stats ---------------- #
+
+    def serve_report(self) -> list:
+        """Share of replies each agent produced locally vs. through the LLM."""
+        agents = [self.fitness_agent, self.nutrition_agent, self.mindfulness_agent, self.analytics_agent]
+        return [a.serve_stats.report() for a in agents if hasattr(a, "serve_stats")]
+
+    def admission_report(self) -> dict | None:
+        """LLM load signals and per-agent shed counts, when admission control is enabled."""
+        return self.admission.report() if self.admission else None
+
     # ---------------- Output for Terminal ---------------- #
 
     def pretty_print(self, res: dict):
@@ -159,7 +217,7 @@ def main():
 
     print("\n📨 Sending OTP...")
     if not orch.auth.start_login(email):
-        print("❌ OTP could not be sent. Check email config.")
+        print("❌ OTP could not be sent. Check email config, or wait a few minutes if you asked for several.")
         return
 
     print(f"📧 OTP sent to {email} — check inbox!")
@@ -169,6 +227,9 @@ def main():
         if orch.auth.verify(email, otp):
             print("\n🎉 Login successful!")
             break
+        if not orch.auth.has_pending(email):
+            print("❌ Too many wrong attempts or the code expired — restart to get a new one.")
+            return
         print("❌ Incorrect OTP — try again.\n")
 
     print("\nLet's get started 😊 What's your name?\n")
@@ -1,6 +1,9 @@
 # memory/memory_service.py
 
 from database.mongo_service import MongoService
+from services.log_archive import LogArchive
+from services.reminder_scheduler import ReminderScheduler
+from utils.tracing import trace_span
 
 
 class MemoryService:
@@ -11,25 +14,40 @@ class MemoryService:
     Responsibilities:
     - Retrieve and update user profiles
     - Append logs for workouts, meals, mood, etc.
+    - Keep streak reminders up to date as logs arrive (when enabled)
+    - Read full log history, including entries tiered into the archive
     - Ensure user exists before writing to storage
     """
 
-    def __init__(self):
-        self.db = MongoService()
+    def __init__(self, db=None, reminders: ReminderScheduler = None, archive: LogArchive = None):
+        self.db = db or MongoService()
+        self.reminders = reminders or ReminderScheduler.from_env(self.db)
+        self.archive = archive or LogArchive(self.db)
 
     # ---------------- Core User Access ---------------- #
 
     def get_user(self, user_id: str) -> dict:
         """Fetch user record. Auto-creates user if missing."""
-        return self.db.get_user(user_id)
+        with trace_span("memory.get_user"):
+            return self.db.get_user(user_id)
 
     def update_profile(self, user_id: str, new_profile: dict) -> None:
         """Update user profile data."""
-        self.db.update_profile(user_id, new_profile)
+        with trace_span("memory.update_profile"):
+            self.db.update_profile(user_id, new_profile)
 
     def append_log(self, user_id: str, category: str, entry: dict) -> None:
         """Store timestamped data such as meals, workouts or moods."""
-        self.db.append_log(user_id, category, entry)
+        with trace_span("memory.append_log", category=category):
+            self.db.append_log(user_id, category, entry)
+            if self.reminders:
+                self.reminders.on_log(user_id, category, entry.get("timestamp"))
+
+    def iter_logs(self, user_id: str, category: str, include_archived: bool = True):
+        """Yield a category's entries oldest → newest; archived blocks are only read if iterated."""
+        if include_archived:
+            yield from self.archive.iter_archived(user_id, category)
+        yield from self.db.get_user(user_id)["logs"].get(category, [])
 
     # ---------------- Optional Helpers ---------------- #
 
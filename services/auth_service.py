@@ -1,13 +1,21 @@
 import random
 import os
+import threading
 import yagmail
 from datetime import datetime, timedelta
 
 
+MAX_ATTEMPTS = 5                     # wrong codes before the OTP is thrown away
+MAX_SENDS = 3                        # codes sent to one address per SEND_WINDOW
+SEND_WINDOW = timedelta(minutes=15)
+
+
 class AuthService:
     def __init__(self, memory_service):
         self.memory = memory_service
         self.otp_store = {}
+        self.sends = {}              # email → recent send times, for the per-address limit
+        self._lock = threading.Lock()
 
         # Email Config
         self.sender_email = os.getenv("SMTP_EMAIL")
@@ -24,10 +32,20 @@ class AuthService:
         return str(random.randint(100000, 999999))
 
     def start_login(self, email: str) -> bool:
-        otp = self.generate_otp()
-        expiry = datetime.utcnow() + timedelta(minutes=5)
+        now = datetime.utcnow()
+        with self._lock:
+            # Prune here: anyone can start a login for any address, and most codes may never be entered
+            self.sends = {e: times for e, times in self.sends.items() if now - times[-1] < SEND_WINDOW}
+            self.otp_store = {e: record for e, record in self.otp_store.items() if now <= record["expires"]}
+            recent = [t for t in self.sends.get(email, []) if now - t < SEND_WINDOW]
+            if len(recent) >= MAX_SENDS:
+                self.sends[email] = recent
+                print(f"⚠️ Too many login codes requested for {email}")
+                return False
+            self.sends[email] = recent + [now]
 
-        self.otp_store[email] = {"otp": otp, "expires": expiry}
+            otp = self.generate_otp()
+            self.otp_store[email] = {"otp": otp, "expires": now + timedelta(minutes=5), "attempts": 0}
 
         # If email sending works
         # If email sending works
@@ -48,17 +66,27 @@ class AuthService:
         return True
 
     def verify(self, email: str, otp_attempt: str) -> bool:
-        record = self.otp_store.get(email)
+        with self._lock:
+            record = self.otp_store.get(email)
 
-        if not record:
-            return False
+            if not record:
+                return False
 
-        if datetime.utcnow() > record["expires"]:
-            del self.otp_store[email]
-            return False
+            if datetime.utcnow() > record["expires"]:
+                del self.otp_store[email]
+                return False
 
-        if otp_attempt == record["otp"]:
-            del self.otp_store[email]
-            return True
+            if otp_attempt == record["otp"]:
+                del self.otp_store[email]
+                return True
+
+            record["attempts"] += 1
+            if record["attempts"] >= MAX_ATTEMPTS:
+                del self.otp_store[email]  # a new code has to be requested
+            return False
 
-        return False
+    def has_pending(self, email: str) -> bool:
+        """True while a code sent to this address can still be entered."""
+        with self._lock:
+            record = self.otp_store.get(email)
+            return bool(record) and datetime.utcnow() <= record["expires"]
@@ -14,17 +14,25 @@ class EmailService:
             raise ValueError("❌ Missing SMTP_EMAIL or SMTP_PASSWORD in .env")
 
     def send_otp(self, to_email, otp):
-        msg = MIMEText(f"🎉 Your Trackr AI Login Code:\n\n👉 {otp}\n\nExpires in 10 minutes.\n\n- Trackr AI")
-        msg["Subject"] = "🔐 Your Trackr AI Login Code"
-        msg["From"] = self.email
-        msg["To"] = to_email
+        body = f"🎉 Your Trackr AI Login Code:\n\n👉 {otp}\n\nExpires in 10 minutes.\n\n- Trackr AI"
+        if self.send_batch([(to_email, "🔐 Your Trackr AI Login Code", body)]):
+            print("📨 OTP email sent ✔")
+            return True
+        return False
 
+    def send_batch(self, messages):
+        """Send (to_email, subject, body) messages over one SMTP connection. Returns the number sent."""
+        sent = 0
         try:
             with smtplib.SMTP_SSL("smtp.gmail.com", 465) as server:
                 server.login(self.email, self.password)
-                server.send_message(msg)
-            print("📨 OTP email sent ✔")
-            return True
+                for to_email, subject, body in messages:
+                    msg = MIMEText(body)
+                    msg["Subject"] = subject
+                    msg["From"] = self.email
+                    msg["To"] = to_email
+                    server.send_message(msg)
+                    sent += 1
         except Exception as e:
             print("❌ Email sending failed:", e)
-            return False
+        return sent
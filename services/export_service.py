@@ -0,0 +1,252 @@
+# services/export_service.py
+
+"""
+Streaming data export for support requests and analytics.
+
+Log entries are streamed out of MongoDB with an aggregation ($unwind per
+category) read through a server-side cursor with a bounded batch size, so
+even a user with years of history is never loaded as one document. Entries
+tiered into the log archive are streamed block by block. Each category is
+written as:
+
+    <out>/<category>.jsonl.gz   the full log entry plus its email, one per line
+    <out>/<category>.parquet    flattened into typed rows, one row group per batch (needs pyarrow)
+
+Memory stays at roughly one batch per open writer regardless of history size.
+
+Run with:
+    python -m services.export_service --out exports/ [--email someone@example.com]
+                                      [--format jsonl parquet] [--batch-size 1000]
+
+--format defaults to jsonl; parquet needs `pip install pyarrow`.
+"""
+
+import argparse
+import gzip
+import json
+import os
+import resource
+import time
+from datetime import datetime
+
+from services.log_archive import decode_block
+
+
+CATEGORIES = ["meals", "workouts", "mood"]
+
+# column → type; every row of a category has exactly these columns
+SCHEMAS = {
+    "meals": {
+        "email": "str", "timestamp": "timestamp", "meal": "str", "items": "list<str>",
+        "food_groups": "list<str>", "parse_confidence": "float", "estimated_calories": "float",
+    },
+    "workouts": {
+        "email": "str", "timestamp": "timestamp", "source": "str", "minutes": "int", "request": "str",
+        "workout_name": "str", "duration": "str", "intensity": "str", "steps": "int", "exercises": "list<str>",
+    },
+    "mood": {
+        "email": "str", "timestamp": "timestamp", "mood": "str", "note": "str",
+        "valence": "float", "arousal": "float", "emotion": "str",
+    },
+}
+
+
+# ---------------- Flattening ---------------- #
+
+def _coerce(value, kind: str):
+    if value is None:
+        return None
+    try:
+        if kind == "int":
+            return int(value)
+        if kind == "float":
+            return float(value)
+        if kind == "list<str>":
+            return [str(v) for v in value] if isinstance(value, list) else [str(value)]
+        if kind == "timestamp":
+            return value.isoformat() if isinstance(value, datetime) else str(value)
+        return str(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def flatten(category: str, email: str, entry: dict) -> dict:
+    """One log entry → one typed row for its category's schema."""
+    if category == "workouts":
+        plan = entry.get("plan") or {}
+        entry = {
+            **entry,
+            "workout_name": plan.get("workout_name"),
+            "duration": plan.get("duration"),
+            "intensity": plan.get("intensity"),
+            "steps": len(plan.get("steps") or []),
+        }
+    entry = {**entry, "email": email}
+    return {column: _coerce(entry.get(column), kind) for column, kind in SCHEMAS[category].items()}
+
+
+# ---------------- Writers ---------------- #
+
+class JsonlWriter:
+    """Lossless output — nested fields (plan steps, tips) are kept as they are stored."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = gzip.open(path, "wt", encoding="utf-8")
+
+    def write_batch(self, entries: list) -> None:
+        self._file.writelines(
+            json.dumps({**entry, "email": email}, ensure_ascii=False, default=_coerce_json) + "\n"
+            for email, entry in entries
+        )
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def _coerce_json(value):
+    return value.isoformat() if isinstance(value, datetime) else str(value)
+
+
+class ParquetWriter:
+    """Columnar output — each batch becomes one row group, so memory is bounded by the batch size."""
+
+    TYPES = {"str": "string", "int": "int64", "float": "float64", "timestamp": "timestamp", "list<str>": "list"}
+
+    def __init__(self, path: str, category: str):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("❌ Parquet export needs pyarrow: pip install pyarrow")
+
+        self.path = path
+        self._pa = pa
+        fields = []
+        for column, kind in SCHEMAS[category].items():
+            if kind == "timestamp":
+                fields.append(pa.field(column, pa.timestamp("us")))
+            elif kind == "list<str>":
+                fields.append(pa.field(column, pa.list_(pa.string())))
+            else:
+                fields.append(pa.field(column, getattr(pa, self.TYPES[kind])()))
+        self.schema = pa.schema(fields)
+        self.category = category
+        self._timestamps = [c for c, kind in SCHEMAS[category].items() if kind == "timestamp"]
+        self._writer = pq.ParquetWriter(path, self.schema, compression="zstd")
+
+    def write_batch(self, entries: list) -> None:
+        rows = [flatten(self.category, email, entry) for email, entry in entries]
+        columns = {name: [row[name] for row in rows] for name in self.schema.names}
+        for name in self._timestamps:
+            columns[name] = [datetime.fromisoformat(v) if v else None for v in columns[name]]
+        self._writer.write_table(self._pa.table(columns, schema=self.schema))
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+# ---------------- Export ---------------- #
+
+class ExportService:
+    """
+    Usage:
+        exporter = ExportService(mongo)
+        for email, entry in exporter.iter_entries("meals", email="someone@example.com"):
+            ...
+        stats = exporter.export("exports/", email=None, formats=("jsonl", "parquet"))
+    """
+
+    def __init__(self, mongo, batch_size: int = 1000, include_archived: bool = True):
+        self.users = mongo.users
+        self.archive = mongo.db["log_archive"]
+        self.batch_size = batch_size
+        self.include_archived = include_archived
+
+    def iter_entries(self, category: str, email: str = None):
+        """Yield (email, entry) for one category — archived entries first, then the hot ones."""
+        match = {"email": email} if email else {}
+
+        if self.include_archived:
+            blocks = self.archive.find({**match, "category": category}, batch_size=1)
+            for block in blocks:  # one compressed block in memory at a time
+                for entry in decode_block(block["data"]):
+                    yield block["email"], entry
+
+        pipeline = [
+            {"$match": match},
+            {"$project": {"email": 1, "entry": f"$logs.{category}"}},
+            {"$unwind": "$entry"},
+        ]
+        cursor = self.users.aggregate(pipeline, allowDiskUse=True, batchSize=self.batch_size)
+        for doc in cursor:
+            yield doc["email"], doc["entry"]
+
+    def export(self, out_dir: str, email: str = None, formats: tuple = ("jsonl",)) -> dict:
+        """Write every category in each format; returns per-category rows, bytes and rate."""
+        os.makedirs(out_dir, exist_ok=True)
+        report = {}
+
+        for category in CATEGORIES:
+            writers = []
+            started, rows, batch = time.perf_counter(), 0, []
+            try:
+                # Parquet first: if pyarrow is missing it raises before any file is opened
+                if "parquet" in formats:
+                    writers.append(ParquetWriter(os.path.join(out_dir, f"{category}.parquet"), category))
+                if "jsonl" in formats:
+                    writers.append(JsonlWriter(os.path.join(out_dir, f"{category}.jsonl.gz")))
+
+                for item in self.iter_entries(category, email):
+                    batch.append(item)
+                    if len(batch) >= self.batch_size:
+                        for writer in writers:
+                            writer.write_batch(batch)
+                        rows += len(batch)
+                        batch = []
+                if batch:
+                    for writer in writers:
+                        writer.write_batch(batch)
+                    rows += len(batch)
+            finally:
+                for writer in writers:
+                    writer.close()
+
+            seconds = time.perf_counter() - started
+            size = sum(os.path.getsize(w.path) for w in writers)
+            report[category] = {
+                "rows": rows,
+                "bytes": size,
+                "seconds": round(seconds, 3),
+                "rows_per_s": round(rows / seconds, 1) if seconds else 0.0,
+            }
+        return report
+
+
+def peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KB on Linux
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream user logs to gzip JSONL and Parquet.")
+    parser.add_argument("--out", default="exports", help="output directory")
+    parser.add_argument("--email", help="export one user (default: everyone)")
+    parser.add_argument("--format", nargs="+", choices=["jsonl", "parquet"], default=["jsonl"],
+                        help="parquet needs pyarrow (not installed by requirements.txt)")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--no-archived", action="store_true", help="skip entries in the log archive")
+    args = parser.parse_args()
+
+    from database.mongo_service import MongoService
+    exporter = ExportService(MongoService(), args.batch_size, include_archived=not args.no_archived)
+    report = exporter.export(args.out, args.email, tuple(args.format))
+
+    print(f"\n📦 Export written to {args.out}/")
+    print(f"{'category':<12}{'rows':>10}{'MB':>9}{'seconds':>10}{'rows/s':>12}")
+    for category, s in report.items():
+        print(f"{category:<12}{s['rows']:>10}{s['bytes'] / 1e6:>9.2f}{s['seconds']:>10}{s['rows_per_s']:>12}")
+    print(f"\n   peak RSS: {peak_rss_mb():.1f} MB\n")
+
+
+if __name__ == "__main__":
+    main()
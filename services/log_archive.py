@@ -0,0 +1,185 @@
+# services/log_archive.py
+
+"""
+Hot/cold tiering for user logs.
+
+Entries older than a horizon are moved out of the user document (which
+MongoService.get_user loads on every message) into gzip-compressed JSONL
+blocks in the `log_archive` collection, one block per user, category and
+run. The user document keeps small rollups under `archived` so
+AnalyticsAgent's totals, streaks and food-group counts stay exact:
+
+    archived.<category>.count          entries moved to the archive
+    archived.<category>.streak         {"last_day", "length"} run ending at the newest archived day
+    archived.meals.meals_with_group    per-group meal counts (+ meals_parsed)
+
+Archived entries are read back lazily, block by block, through
+MemoryService.iter_logs().
+
+Run the tiering job with:
+    python -m services.log_archive --horizon-days 90 [--email someone@example.com]
+"""
+
+import argparse
+import gzip
+import json
+import time
+from datetime import datetime, timedelta
+
+from bson import encode as bson_encode
+from pymongo import ASCENDING
+
+from services.reminder_scheduler import ReminderScheduler
+
+
+CATEGORIES = ["meals", "workouts", "mood"]
+CODEC = "gzip"
+
+
+def encode_block(entries: list) -> bytes:
+    lines = "\n".join(json.dumps(e, ensure_ascii=False, default=str) for e in entries)
+    return gzip.compress(lines.encode("utf-8"))
+
+
+def decode_block(data: bytes) -> list:
+    return [json.loads(line) for line in gzip.decompress(data).decode("utf-8").splitlines() if line]
+
+
+class LogArchive:
+    def __init__(self, mongo):
+        self.mongo = mongo
+        self.users = mongo.users
+        self.blocks = mongo.db["log_archive"]
+        self.blocks.create_index([("email", ASCENDING), ("category", ASCENDING), ("to_ts", ASCENDING)], unique=True)
+
+    # ---------------- Tiering ---------------- #
+
+    def archive_user(self, email: str, horizon_days: int = 90, now: datetime = None) -> dict:
+        """
+        Move entries older than the horizon into archive blocks. The cutoff is
+        aligned to midnight so no day is split between hot and cold storage.
+        Safe to re-run after a crash: entries already archived are only pulled.
+        """
+        now = now or datetime.utcnow()
+        cutoff = (now - timedelta(days=horizon_days)).replace(hour=0, minute=0, second=0, microsecond=0)
+        cutoff_ts = cutoff.isoformat()
+
+        user = self.users.find_one({"email": email}, {"logs": 1, "archived": 1})
+        if not user:
+            return {"archived": 0}
+
+        rollups = user.get("archived", {})
+        update_set, update_inc, pulls, moved = {}, {}, {}, 0
+
+        for category in CATEGORIES:
+            old = [e for e in user.get("logs", {}).get(category, []) if e.get("timestamp", "") < cutoff_ts]
+            if not old:
+                continue
+            pulls[f"logs.{category}"] = {"timestamp": {"$lt": cutoff_ts}}
+
+            rollup = rollups.get(category, {})
+            already_to = rollup.get("to_ts", "")
+            fresh = sorted((e for e in old if e["timestamp"] > already_to), key=lambda e: e["timestamp"])
+            if not fresh:
+                continue  # crashed after writing the block last time — just finish the pull
+
+            self.blocks.update_one(
+                {"email": email, "category": category, "to_ts": fresh[-1]["timestamp"]},
+                {"$setOnInsert": {
+                    "from_ts": fresh[0]["timestamp"],
+                    "count": len(fresh),
+                    "codec": CODEC,
+                    "data": encode_block(fresh),
+                    "created_at": now
+                }},
+                upsert=True
+            )
+
+            streak = rollup.get("streak")
+            for day in sorted({datetime.fromisoformat(e["timestamp"]).date() for e in fresh}):
+                streak = ReminderScheduler.advance(streak, day)
+
+            update_set[f"archived.{category}.streak"] = streak
+            update_set[f"archived.{category}.to_ts"] = fresh[-1]["timestamp"]
+            update_inc[f"archived.{category}.count"] = len(fresh)
+            if category == "meals":
+                parsed = [e for e in fresh if "food_groups" in e]
+                update_inc["archived.meals.meals_parsed"] = len(parsed)
+                for entry in parsed:
+                    for group in entry["food_groups"]:
+                        key = f"archived.meals.meals_with_group.{group}"
+                        update_inc[key] = update_inc.get(key, 0) + 1
+            moved += len(fresh)
+
+        if pulls:
+            update = {"$pull": pulls}
+            if update_set:
+                update["$set"] = update_set
+            if update_inc:
+                update["$inc"] = update_inc
+            self.users.update_one({"email": email}, update)
+
+        return {"archived": moved}
+
+    # ---------------- Lazy Reads ---------------- #
+
+    def iter_archived(self, email: str, category: str):
+        """Yield archived entries oldest → newest, decompressing one block at a time."""
+        blocks = self.blocks.find(
+            {"email": email, "category": category}, {"data": 0},
+            sort=[("to_ts", ASCENDING)]
+        )
+        for block in blocks:
+            full = self.blocks.find_one({"_id": block["_id"]}, {"data": 1})
+            yield from decode_block(full["data"])
+
+
+# ---------------- Job ---------------- #
+
+def _measure(mongo, email: str, repeats: int = 5) -> tuple[int, float]:
+    """(hot document size in bytes, average get_user latency in ms)."""
+    started = time.perf_counter()
+    for _ in range(repeats):
+        user = mongo.get_user(email)
+    latency_ms = (time.perf_counter() - started) * 1000 / repeats
+    return len(bson_encode(user)), latency_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Move old log entries into compressed archive blocks.")
+    parser.add_argument("--horizon-days", type=int, default=90)
+    parser.add_argument("--email", help="only tier this user")
+    parser.add_argument("--batch-size", type=int, default=200)
+    args = parser.parse_args()
+
+    from database.mongo_service import MongoService
+    mongo = MongoService()
+    archive = LogArchive(mongo)
+
+    query = {"email": args.email} if args.email else {}
+    totals = {"users": 0, "entries": 0, "bytes_before": 0, "bytes_after": 0, "ms_before": 0.0, "ms_after": 0.0}
+
+    for user in mongo.users.find(query, {"email": 1}, batch_size=args.batch_size):
+        email = user["email"]
+        size_before, ms_before = _measure(mongo, email)
+        result = archive.archive_user(email, args.horizon_days)
+        if not result["archived"]:
+            continue
+        size_after, ms_after = _measure(mongo, email)
+
+        totals["users"] += 1
+        totals["entries"] += result["archived"]
+        totals["bytes_before"] += size_before
+        totals["bytes_after"] += size_after
+        totals["ms_before"] += ms_before
+        totals["ms_after"] += ms_after
+
+    users = totals["users"] or 1
+    print(f"🗄 Archived {totals['entries']} entries from {totals['users']} users")
+    print(f"   hot document size: {totals['bytes_before'] / users / 1024:.1f} KB → "
+          f"{totals['bytes_after'] / users / 1024:.1f} KB (avg per tiered user)")
+    print(f"   get_user latency:  {totals['ms_before'] / users:.2f} ms → {totals['ms_after'] / users:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
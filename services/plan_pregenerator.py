@@ -0,0 +1,239 @@
+# services/plan_pregenerator.py
+
+"""
+Speculative pre-generation of daily workout plans.
+
+Users who ask for the same free-form workout at about the same time every
+day pay the full Gemini latency each time. This job learns, per user, the
+usual request time (circular mean of the time of day in `logs.workouts`),
+the usual minute count and the usual request text, generates that plan
+during an off-peak window, and stores it in `precomputed_plans` valid for
+a window around the expected time. FitnessAgent serves a matching,
+still-valid plan instantly through claim().
+
+Counters in `plan_pregen_stats` (shared by every process):
+    generated   plans generated ahead of time
+    hits        precomputed plans served
+    misses      LLM-path requests from a user whose pending plan didn't match
+    wasted      plans that expired unserved
+
+Run the job with:
+    python -m services.plan_pregenerator [--interval 900] [--once]
+
+Configured through .env:
+    PLAN_PREGEN=1                 let FitnessAgent serve precomputed plans
+    PLAN_PREGEN_OFFPEAK=0-6       UTC hours during which plans are generated
+    PLAN_PREGEN_WINDOW_MIN=90     plan is valid this long either side of the usual time
+"""
+
+import argparse
+import math
+import os
+import re
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+
+from pymongo import ASCENDING
+
+
+LLM_SOURCES = {"llm", "fallback", "shed", "precomputed", None}  # requests the local composer didn't serve
+HISTORY = 14            # most recent LLM-path workouts considered
+MIN_DAYS = 3            # distinct days needed before a habit is trusted
+MAX_SPREAD_MIN = 90     # circular std-dev of request time-of-day, in minutes
+MIN_OVERLAP = 0.5       # word-set Jaccard overlap for a request to count as "the usual one"
+
+
+def same_request(a: str, b: str) -> bool:
+    words_a, words_b = set(re.findall(r"[a-z]+", a.lower())), set(re.findall(r"[a-z]+", b.lower()))
+    if not words_a or not words_b:
+        return False
+    return len(words_a & words_b) / len(words_a | words_b) >= MIN_OVERLAP
+
+
+def learn_pattern(workouts: list) -> dict | None:
+    """Usual time of day, minutes and request text from a user's workout log, or None if there's no habit."""
+    entries = [w for w in workouts if w.get("source") in LLM_SOURCES and w.get("timestamp")][-HISTORY:]
+    times = [datetime.fromisoformat(w["timestamp"]) for w in entries]
+    if len({t.date() for t in times}) < MIN_DAYS:
+        return None
+
+    angles = [(t.hour * 60 + t.minute) / 1440 * 2 * math.pi for t in times]
+    x = sum(math.cos(a) for a in angles) / len(angles)
+    y = sum(math.sin(a) for a in angles) / len(angles)
+    resultant = math.hypot(x, y)
+    if resultant == 0:
+        return None
+    spread_min = math.sqrt(-2 * math.log(resultant)) / (2 * math.pi) * 1440
+    if spread_min > MAX_SPREAD_MIN:
+        return None
+
+    usual_minute = round((math.atan2(y, x) % (2 * math.pi)) / (2 * math.pi) * 1440) % 1440
+    requests = Counter(w.get("request") for w in entries if w.get("request"))
+    return {
+        "minute_of_day": usual_minute,
+        "minutes": Counter(w.get("minutes", 20) for w in entries).most_common(1)[0][0],
+        "request": requests.most_common(1)[0][0] if requests else "a workout for today",
+        "spread_min": round(spread_min, 1)
+    }
+
+
+def _parse_hours(spec: str) -> tuple[int, int]:
+    start, end = spec.split("-")
+    return int(start), int(end)
+
+
+class PlanPregenerator:
+    def __init__(self, mongo, agent=None, offpeak: tuple = (0, 6), window_min: int = 90):
+        self.users = mongo.users
+        self.plans = mongo.db["precomputed_plans"]
+        self.stats = mongo.db["plan_pregen_stats"]
+        self.agent = agent          # FitnessAgent used to generate (job side only)
+        self.offpeak = offpeak
+        self.window = timedelta(minutes=window_min)
+
+        self.plans.create_index([("email", ASCENDING)], unique=True)
+        self.plans.create_index([("expires_at", ASCENDING)])
+
+    @classmethod
+    def from_env(cls, mongo, agent=None):
+        if os.getenv("PLAN_PREGEN", "").lower() not in ("1", "true", "yes"):
+            return None
+        return cls(
+            mongo, agent,
+            offpeak=_parse_hours(os.getenv("PLAN_PREGEN_OFFPEAK", "0-6")),
+            window_min=int(os.getenv("PLAN_PREGEN_WINDOW_MIN", "90"))
+        )
+
+    # ---------------- Serving (FitnessAgent) ---------------- #
+
+    def claim(self, email: str, request: str, minutes: int, now: datetime = None) -> dict | None:
+        """Return and mark served a valid plan matching this request; None (and count a miss) otherwise."""
+        now = now or datetime.utcnow()
+        pending = self.plans.find_one({"email": email, "served_at": None, "expires_at": {"$gt": now}})
+        if not pending:
+            return None
+
+        matches = same_request(pending["request"], request) and pending["minutes"] == minutes
+        if matches and pending["valid_from"] <= now:
+            result = self.plans.update_one({"_id": pending["_id"], "served_at": None}, {"$set": {"served_at": now}})
+            if result.modified_count:
+                self._count(hits=1)
+                return pending["plan"]
+
+        self._count(misses=1)
+        return None
+
+    # ---------------- Background Job ---------------- #
+
+    def in_offpeak(self, now: datetime) -> bool:
+        start, end = self.offpeak
+        return start <= now.hour < end if start <= end else (now.hour >= start or now.hour < end)
+
+    def next_target(self, pattern: dict, now: datetime) -> datetime:
+        """Next occurrence of the usual time whose validity window hasn't started yet."""
+        midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        target = midnight + timedelta(minutes=pattern["minute_of_day"])
+        if target - self.window <= now:
+            target += timedelta(days=1)
+        return target
+
+    def sweep(self, now: datetime) -> int:
+        """Drop expired plans, counting the unserved ones as wasted."""
+        expired = {"expires_at": {"$lte": now}}
+        wasted = self.plans.count_documents({**expired, "served_at": None})
+        self.plans.delete_many(expired)
+        if wasted:
+            self._count(wasted=wasted)
+        return wasted
+
+    def run_once(self, now: datetime = None, batch_size: int = 200) -> dict:
+        now = now or datetime.utcnow()
+        result = {"wasted": self.sweep(now), "generated": 0}
+        if not self.in_offpeak(now):
+            return result
+
+        projection = {"email": 1, "profile": 1, "logs.workouts": {"$slice": -HISTORY * 3}}
+        for user in self.users.find({"onboarding_status.completed": True}, projection, batch_size=batch_size):
+            email = user["email"]
+            if self.plans.find_one({"email": email}):
+                continue  # one pending plan per user
+
+            pattern = learn_pattern(user.get("logs", {}).get("workouts", []))
+            if pattern is None:
+                continue
+
+            plan, source = self.agent._generate_with_llm(pattern["request"], user.get("profile", {}),
+                                                         pattern["minutes"])
+            if source != "llm":
+                continue  # don't park a canned fallback as if it were a personalised plan
+
+            target = self.next_target(pattern, now)
+            self.plans.update_one(
+                {"email": email},
+                {"$set": {
+                    "plan": plan,
+                    "request": pattern["request"],
+                    "minutes": pattern["minutes"],
+                    "target_at": target,
+                    "valid_from": target - self.window,
+                    "expires_at": target + self.window,
+                    "generated_at": now,
+                    "served_at": None
+                }},
+                upsert=True
+            )
+            self._count(generated=1)
+            result["generated"] += 1
+        return result
+
+    # ---------------- Stats ---------------- #
+
+    def _count(self, **increments) -> None:
+        self.stats.update_one({"_id": "fitness"}, {"$inc": increments}, upsert=True)
+
+    def report(self) -> dict:
+        totals = self.stats.find_one({"_id": "fitness"}) or {}
+        generated, hits = totals.get("generated", 0), totals.get("hits", 0)
+        wasted, misses = totals.get("wasted", 0), totals.get("misses", 0)
+        return {
+            "generated": generated,
+            "hits": hits,
+            "misses": misses,
+            "wasted": wasted,
+            "hit_rate": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+            "waste_rate": round(wasted / generated, 4) if generated else 0.0
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-generate workout plans for users with a daily habit.")
+    parser.add_argument("--interval", type=int, default=900, help="seconds between runs")
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--once", action="store_true", help="run one pass and print stats")
+    args = parser.parse_args()
+
+    from memory.memory_service import MemoryService
+    from tools.gemini_client import GeminiClient
+    from agents.fitness_agent import FitnessAgent
+
+    memory = MemoryService()
+    pregen = PlanPregenerator(
+        memory.db, FitnessAgent(memory, GeminiClient()),
+        offpeak=_parse_hours(os.getenv("PLAN_PREGEN_OFFPEAK", "0-6")),
+        window_min=int(os.getenv("PLAN_PREGEN_WINDOW_MIN", "90"))
+    )
+
+    while True:
+        result = pregen.run_once(batch_size=args.batch_size)
+        if result["generated"] or result["wasted"] or args.once:
+            stats = pregen.report()
+            print(f"🗓 Pre-generated {result['generated']} plans (expired unserved: {result['wasted']}) — "
+                  f"hit rate {stats['hit_rate']:.1%}, waste rate {stats['waste_rate']:.1%}")
+        if args.once:
+            break
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
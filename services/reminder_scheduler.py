@@ -0,0 +1,218 @@
+# services/reminder_scheduler.py
+
+"""
+Streak-at-risk reminder scheduler.
+
+Each user has one document in the `reminders` collection holding their
+per-category streak state (same rules as AnalyticsAgent.calculate_streak)
+and `due_at` — when their next reminder should go out. The ascending index
+on `due_at` is the time-ordered structure: updates are O(log n), "what is
+due now" is an index range scan, and since it lives in the store the
+schedule is intact after a restart. No scan over user documents is needed.
+
+- on_log():   called from MemoryService.append_log, updates the streak and due_at
+- fire_due(): sends due reminders in batches through EmailService
+
+Run the firing loop with:
+    python -m services.reminder_scheduler [--interval 300] [--backfill]
+
+Configured through .env:
+    STREAK_REMINDERS=1       track streaks on every append_log
+    REMINDER_HOUR_UTC        hour of the evening nudge (default 19)
+    REMINDER_MIN_STREAK      only nudge streaks at least this long (default 2)
+"""
+
+import argparse
+import os
+import time
+from datetime import datetime, date, timedelta
+
+from pymongo import ASCENDING
+
+
+CATEGORIES = {"workouts": "workout", "meals": "meal logging", "mood": "check-in"}
+# What keeps each streak alive — streaks are per category, so each needs its own action.
+ACTIONS = {
+    "workouts": "a 5-minute workout keeps it alive",
+    "meals": "logging one meal keeps it alive",
+    "mood": "a quick mood check-in keeps it alive",
+}
+STALE_AFTER = timedelta(hours=4)  # a reminder this late (e.g. after downtime) is skipped, not sent
+
+
+class ReminderScheduler:
+    def __init__(self, mongo, email_service=None, reminder_hour: int = 19, min_streak: int = 2):
+        self.reminders = mongo.db["reminders"]
+        self.users = mongo.users
+        self.email_service = email_service
+        self.reminder_hour = reminder_hour
+        self.min_streak = min_streak
+
+        self.reminders.create_index([("email", ASCENDING)], unique=True)
+        self.reminders.create_index([("due_at", ASCENDING)])
+
+    @classmethod
+    def from_env(cls, mongo):
+        if os.getenv("STREAK_REMINDERS", "").lower() not in ("1", "true", "yes"):
+            return None
+        return cls(
+            mongo,
+            reminder_hour=int(os.getenv("REMINDER_HOUR_UTC", "19")),
+            min_streak=int(os.getenv("REMINDER_MIN_STREAK", "2"))
+        )
+
+    # ---------------- Streak State ---------------- #
+
+    @staticmethod
+    def advance(state: dict | None, day: date) -> dict:
+        """Fold one log day into {"last_day", "length"} — incremental calculate_streak."""
+        if not state:
+            return {"last_day": day.isoformat(), "length": 1}
+
+        last_day = date.fromisoformat(state["last_day"])
+        if day <= last_day:
+            return state  # same day, or an older backfilled entry
+        if day == last_day + timedelta(days=1):
+            return {"last_day": day.isoformat(), "length": state["length"] + 1}
+        return {"last_day": day.isoformat(), "length": 1}
+
+    def due_time(self, state: dict) -> datetime:
+        """The streak breaks if nothing is logged the day after last_day — nudge that evening."""
+        at_risk_day = date.fromisoformat(state["last_day"]) + timedelta(days=1)
+        return datetime.combine(at_risk_day, datetime.min.time()) + timedelta(hours=self.reminder_hour)
+
+    def at_risk(self, state: dict, day: date) -> bool:
+        """True when `day` is the streak's last chance — earlier it's safe, later it has already broken."""
+        return state["length"] >= self.min_streak and self.due_time(state).date() == day
+
+    def next_due(self, streaks: dict, after: datetime) -> datetime | None:
+        due = [
+            self.due_time(state) for state in streaks.values()
+            if state["length"] >= self.min_streak and self.due_time(state) > after
+            and self.due_time(state).date() >= after.date()  # never a streak that already broke
+        ]
+        return min(due) if due else None
+
+    # ---------------- Incremental Updates ---------------- #
+
+    def on_log(self, email: str, category: str, timestamp: str) -> None:
+        if category not in CATEGORIES or not timestamp:
+            return
+
+        doc = self.reminders.find_one({"email": email}) or {"streaks": {}}
+        streaks = doc.get("streaks", {})
+        day = datetime.fromisoformat(timestamp).date()
+
+        updated = self.advance(streaks.get(category), day)
+        if updated is streaks.get(category):
+            return
+        streaks[category] = updated
+
+        self.reminders.update_one(
+            {"email": email},
+            {"$set": {"streaks": streaks, "due_at": self.next_due(streaks, datetime.utcnow())}},
+            upsert=True
+        )
+
+    def backfill(self, batch_size: int = 500) -> int:
+        """One-off: build reminder state for users who logged before tracking was enabled."""
+        count = 0
+        projection = {"email": 1, **{f"logs.{c}.timestamp": 1 for c in CATEGORIES}}
+        for user in self.users.find({}, projection, batch_size=batch_size):
+            streaks = {}
+            for category in CATEGORIES:
+                days = sorted({datetime.fromisoformat(e["timestamp"]).date()
+                               for e in user.get("logs", {}).get(category, []) if e.get("timestamp")})
+                for day in days:
+                    streaks[category] = self.advance(streaks.get(category), day)
+            if streaks:
+                self.reminders.update_one(
+                    {"email": user["email"]},
+                    {"$set": {"streaks": streaks, "due_at": self.next_due(streaks, datetime.utcnow())}},
+                    upsert=True
+                )
+                count += 1
+        return count
+
+    # ---------------- Firing ---------------- #
+
+    def fire_due(self, now: datetime = None, batch_size: int = 500) -> dict:
+        """Send every reminder due by `now`, batch by batch, and reschedule each user."""
+        now = now or datetime.utcnow()
+        stats = {"sent": 0, "skipped_stale": 0, "batches": 0}
+
+        while True:
+            batch = list(self.reminders.find({"due_at": {"$lte": now}}, sort=[("due_at", ASCENDING)],
+                                             limit=batch_size))
+            if not batch:
+                break
+            stats["batches"] += 1
+
+            fresh, idle = [], []  # idle: due, but nothing is at risk today any more
+            for doc in batch:
+                if now - doc["due_at"] > STALE_AFTER:
+                    continue
+                (fresh if any(self.at_risk(s, now.date()) for s in doc["streaks"].values()) else idle).append(doc)
+            messages = [self.compose(doc, now) for doc in fresh]
+            sent = self._send(messages) if messages else 0
+
+            # Reschedule what was handled; unsent reminders stay due and retry next tick.
+            handled = fresh[:sent] + idle + [doc for doc in batch if now - doc["due_at"] > STALE_AFTER]
+            for doc in handled:
+                self.reminders.update_one(
+                    {"email": doc["email"], "due_at": doc["due_at"]},
+                    {"$set": {"due_at": self.next_due(doc["streaks"], now), "last_sent_at": now}}
+                )
+            stats["sent"] += sent
+            stats["skipped_stale"] += len(batch) - len(fresh) - len(idle)
+
+            if sent < len(messages):
+                break  # mail path is failing — retry on the next tick rather than spin
+        return stats
+
+    def compose(self, doc: dict, now: datetime) -> tuple:
+        at_risk = [
+            (category, state) for category, state in doc["streaks"].items()
+            if self.at_risk(state, now.date())
+        ]
+        lines = "\n".join(
+            f"• {state['length']}-day {CATEGORIES[category]} streak — {ACTIONS[category]}"
+            for category, state in at_risk
+        )
+        headline = "Your streak ends tonight!" if len(at_risk) == 1 else "Your streaks end tonight!"
+        body = f"🔥 {headline}\n\n{lines}\n\n💛 Trackr AI"
+        return doc["email"], "🔥 Keep your Trackr streak going", body
+
+    def _send(self, messages: list) -> int:
+        if self.email_service is None:
+            from services.email_service import EmailService
+            self.email_service = EmailService()
+        return self.email_service.send_batch(messages)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fire streak-at-risk reminders.")
+    parser.add_argument("--interval", type=int, default=300, help="seconds between checks")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--backfill", action="store_true", help="build reminder state from existing logs first")
+    args = parser.parse_args()
+
+    from database.mongo_service import MongoService
+    scheduler = ReminderScheduler(
+        MongoService(),
+        reminder_hour=int(os.getenv("REMINDER_HOUR_UTC", "19")),
+        min_streak=int(os.getenv("REMINDER_MIN_STREAK", "2"))
+    )
+
+    if args.backfill:
+        print(f"🗂 Backfilled reminder state for {scheduler.backfill(args.batch_size)} users")
+
+    while True:
+        stats = scheduler.fire_due(batch_size=args.batch_size)
+        if stats["sent"] or stats["skipped_stale"]:
+            print(f"📨 Reminders sent: {stats['sent']} (stale skipped: {stats['skipped_stale']})")
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,356 @@
+# services/worker_pool.py
+
+"""
+Multi-process serving mode.
+
+Runs N worker processes, each with its own Orchestrator (and therefore its
+own Mongo pool and Gemini client), and routes every message by consistent
+hashing on the user's email:
+
+- Per-user ordering: one user maps to one worker, which handles its inbox
+  FIFO on a single thread — onboarding steps and log appends stay in order.
+- Backpressure: each worker inbox is bounded; submit() blocks when it is full.
+- Rebalancing: resize() swaps the hash ring without pausing traffic. A user
+  with requests still in flight on their old worker keeps being routed there
+  until those finish, then moves to the new owner.
+- Liveness: a worker that dies fails its pending requests and is restarted;
+  one that dies before it finished starting (e.g. Mongo unreachable) is
+  dropped from the ring instead of being restarted in a loop.
+"""
+
+import bisect
+import hashlib
+import itertools
+import multiprocessing
+import queue
+import threading
+from concurrent.futures import Future
+
+
+VNODES = 64
+LIVENESS_INTERVAL_S = 0.5  # how often the collector checks for dead workers
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.md5(key.encode("utf-8")).digest()[:8], "big")
+
+
+class HashRing:
+    """Consistent hash ring with virtual nodes — resizing moves ~1/N of the users."""
+
+    def __init__(self, nodes: list, vnodes: int = VNODES):
+        points = sorted((_hash(f"{node}#{i}"), node) for node in nodes for i in range(vnodes))
+        self._hashes = [h for h, _ in points]
+        self._nodes = [n for _, n in points]
+
+    def node_for(self, key: str):
+        index = bisect.bisect(self._hashes, _hash(key)) % len(self._hashes)
+        return self._nodes[index]
+
+
+def build_orchestrator():
+    """Default worker factory: a production Orchestrator (real Mongo + Gemini)."""
+    from main import Orchestrator
+    return Orchestrator()
+
+
+# ---------------- Worker Process ---------------- #
+
+class _LastRootExporter:
+    """Keeps the attributes of the most recent root span (one request at a time per worker)."""
+
+    def __init__(self):
+        self.last = {}
+
+    def export(self, span) -> None:
+        if span.parent_id is None and span.name == "orchestrator.handle":
+            self.last = dict(span.attributes)
+
+
+def _worker_main(worker_id: int, factory, factory_kwargs: dict, inbox, outbox) -> None:
+    exporter = None
+    if factory_kwargs.pop("_trace_roots", False):
+        from utils.tracing import Tracer, set_tracer
+        exporter = _LastRootExporter()
+        set_tracer(Tracer(exporter, sample_rate=1.0))
+
+    orch = factory(**factory_kwargs)
+    outbox.put((None, worker_id, None, {}))  # ready
+
+    while True:
+        item = inbox.get()
+        if item is None:
+            break
+
+        kind, request_id = item[0], item[1]
+        try:
+            if kind == "handle":
+                reply = orch.handle(item[2], item[3])
+                meta = exporter.last if exporter else {}
+                outbox.put((request_id, reply, None, meta))
+            elif kind == "call":
+                func, email, args = item[2], item[3], item[4]
+                outbox.put((request_id, func(orch, email, *args), None, {}))
+            elif kind == "report":
+                outbox.put((request_id, orch.serve_report(), None, {}))
+        except Exception as e:
+            outbox.put((request_id, None, f"{type(e).__name__}: {e}", exporter.last if exporter else {}))
+
+
+# ---------------- Pool ---------------- #
+
+class WorkerPool:
+    """
+    Usage:
+        pool = WorkerPool(workers=4)
+        pool.wait_ready(timeout=60)              # optional: every worker has built its Orchestrator
+        reply = pool.handle(email, message)      # same contract as Orchestrator.handle
+        future = pool.submit(email, message)     # non-blocking
+        pool.resize(8)
+        pool.close()
+    """
+
+    def __init__(self, factory=build_orchestrator, workers: int = None, queue_size: int = 256,
+                 factory_kwargs: dict = None, trace_roots: bool = False):
+        self.factory = factory
+        self.factory_kwargs = dict(factory_kwargs or {})
+        self.queue_size = queue_size
+        self.trace_roots = trace_roots
+
+        self._ctx = multiprocessing.get_context("spawn")  # fresh interpreter: no inherited Mongo sockets
+        self._outbox = self._ctx.Queue()
+        self._workers = {}          # worker_id → (process, inbox)
+        self._ready = set()         # workers whose factory finished
+        self._retiring = set()
+        self._stopped = []          # retired (process, inbox), joined on close()
+        self._inflight = {}         # email → [worker_id, pending count]
+        self._futures = {}          # request_id → (future, email | None, worker_id)
+        self._lock = threading.Lock()
+        self._ready_changed = threading.Condition(self._lock)
+        self._ids = itertools.count()
+        self._worker_ids = itertools.count()
+
+        self._ring = None
+        self.resize(workers or multiprocessing.cpu_count())
+
+        self._collector = threading.Thread(target=self._collect, name="worker-pool-collector", daemon=True)
+        self._collector.start()
+
+    # ---------------- Routing ---------------- #
+
+    def submit(self, email: str, message: str) -> Future:
+        """Queue a message; the Future resolves to the reply dict (meta on `future.meta`)."""
+        return self._dispatch(email, lambda request_id: ("handle", request_id, email, message))
+
+    def handle(self, email: str, message: str) -> dict:
+        return self.submit(email, message).result()
+
+    def call(self, email: str, func, *args):
+        """Run `func(orchestrator, email, *args)` on the user's worker, in order with their messages."""
+        return self._dispatch(email, lambda request_id: ("call", request_id, func, email, args)).result()
+
+    def _dispatch(self, email: str, make_item) -> Future:
+        future = Future()
+        future.meta = {}
+        with self._lock:
+            if self._ring is None:
+                future.set_exception(RuntimeError("No live workers in the pool"))
+                return future
+            request_id = next(self._ids)
+            sticky = self._inflight.get(email)
+            worker_id = sticky[0] if sticky else self._ring.node_for(email)
+            if sticky:
+                sticky[1] += 1
+            else:
+                self._inflight[email] = [worker_id, 1]
+            self._futures[request_id] = (future, email, worker_id)
+            inbox = self._workers[worker_id][1]
+
+        item = make_item(request_id)
+        while not future.done():  # blocks while the worker's queue is full, unless the worker dies
+            try:
+                inbox.put(item, timeout=LIVENESS_INTERVAL_S)
+                break
+            except queue.Full:
+                continue
+        return future
+
+    def _collect(self) -> None:
+        while True:
+            try:
+                result = self._outbox.get(timeout=LIVENESS_INTERVAL_S)
+            except queue.Empty:
+                self._reap_dead_workers()
+                continue
+            if result is None:
+                break
+            request_id, value, error, meta = result
+
+            if request_id is None:
+                with self._lock:
+                    self._ready.add(value)
+                    self._ready_changed.notify_all()
+                continue
+
+            with self._lock:
+                entry = self._futures.pop(request_id, None)
+                if entry is None:
+                    continue  # already failed when its worker was reaped
+                future, email, _ = entry
+                self._release(email)
+                self._stop_drained_workers()
+
+            future.meta = meta
+            if error:
+                future.set_exception(RuntimeError(error))
+            else:
+                future.set_result(value)
+            self._reap_dead_workers()
+
+    def _release(self, email: str | None) -> None:
+        if email is None:
+            return
+        entry = self._inflight[email]
+        entry[1] -= 1
+        if entry[1] == 0:
+            del self._inflight[email]
+
+    # ---------------- Liveness ---------------- #
+
+    def wait_ready(self, timeout: float = None) -> bool:
+        """Block until every active worker has built its Orchestrator; False on timeout or if none are left."""
+        def all_ready():
+            active = [w for w in self._workers if w not in self._retiring]
+            return bool(active) and all(w in self._ready for w in active)
+
+        with self._ready_changed:
+            self._ready_changed.wait_for(lambda: all_ready() or not self._workers, timeout)
+            return all_ready()
+
+    def _reap_dead_workers(self) -> None:
+        """Fail requests pending on dead workers, then restart them (or drop them if they never started)."""
+        failed = []
+        with self._lock:
+            dead = [w for w, (process, _) in self._workers.items() if not process.is_alive()]
+            if not dead:
+                return
+
+            for worker_id in dead:
+                process, inbox = self._workers.pop(worker_id)
+                self._stopped.append((process, inbox))
+                started = worker_id in self._ready
+                self._ready.discard(worker_id)
+                print(f"⚠️ Worker {worker_id} exited (code {process.exitcode})"
+                      f"{'' if started else ' before it finished starting'}")
+
+                for request_id, (future, email, owner) in list(self._futures.items()):
+                    if owner == worker_id:
+                        del self._futures[request_id]
+                        self._release(email)
+                        failed.append((future, f"Worker {worker_id} died (exit code {process.exitcode})"))
+
+                if worker_id in self._retiring:
+                    self._retiring.discard(worker_id)
+                elif started:
+                    self._start_worker()
+
+            active = [w for w in self._workers if w not in self._retiring]
+            self._ring = HashRing(active) if active else None
+            self._stop_drained_workers()
+            self._ready_changed.notify_all()
+
+        for future, message in failed:
+            future.set_exception(RuntimeError(message))
+
+    # ---------------- Rebalancing ---------------- #
+
+    def resize(self, workers: int) -> None:
+        """Change the worker count. Moved users follow once their in-flight requests finish."""
+        with self._lock:
+            active = [w for w in self._workers if w not in self._retiring]
+
+            while len(active) < workers:
+                active.append(self._start_worker())
+            for worker_id in active[workers:]:
+                self._retiring.add(worker_id)
+            active = active[:workers]
+
+            self._ring = HashRing(active) if active else None
+            self._stop_drained_workers()
+
+    def _start_worker(self) -> int:
+        worker_id = next(self._worker_ids)
+        inbox = self._ctx.Queue(maxsize=self.queue_size)
+        kwargs = dict(self.factory_kwargs, _trace_roots=self.trace_roots)
+        process = self._ctx.Process(
+            target=_worker_main, args=(worker_id, self.factory, kwargs, inbox, self._outbox),
+            name=f"trackr-worker-{worker_id}", daemon=True
+        )
+        process.start()
+        self._workers[worker_id] = (process, inbox)
+        return worker_id
+
+    def _stop_drained_workers(self) -> None:
+        busy = {worker_id for worker_id, _ in self._inflight.values()}
+        for worker_id in list(self._retiring):
+            if worker_id not in busy:
+                process, inbox = self._workers.pop(worker_id)
+                inbox.put(None)
+                self._retiring.discard(worker_id)
+                self._stopped.append((process, inbox))  # inbox must outlive a still-starting child
+
+    # ---------------- Reporting / Shutdown ---------------- #
+
+    @property
+    def worker_count(self) -> int:
+        return len(self._workers) - len(self._retiring)
+
+    def serve_report(self) -> list:
+        """Merge each worker's Orchestrator.serve_report() into one per-agent report."""
+        futures = []
+        for worker_id in list(self._workers):
+            future = Future()
+            with self._lock:
+                request_id = next(self._ids)
+                self._futures[request_id] = (future, None, worker_id)
+            self._workers[worker_id][1].put(("report", request_id))
+            futures.append(future)
+
+        merged = {}
+        for future in futures:
+            for report in future.result():
+                m = merged.setdefault(report["agent"], {"agent": report["agent"], "requests": 0, "served_locally": 0,
+                                                        "shed": 0, "local_ms": 0.0, "llm_ms": 0.0})
+                m["requests"] += report["requests"]
+                m["served_locally"] += report["served_locally"]
+                m["shed"] += report["shed"]
+                m["local_ms"] += report["avg_local_ms"] * report["served_locally"]
+                m["llm_ms"] += report["avg_llm_ms"] * (report["requests"] - report["served_locally"] - report["shed"])
+
+        reports = []
+        for m in merged.values():
+            local, llm = m["served_locally"], m["requests"] - m["served_locally"] - m["shed"]
+            avg_local = m["local_ms"] / local if local else 0.0
+            avg_llm = m["llm_ms"] / llm if llm else 0.0
+            reports.append({
+                "agent": m["agent"],
+                "requests": m["requests"],
+                "served_locally": local,
+                "shed": m["shed"],
+                "local_share": round(local / m["requests"], 4) if m["requests"] else 0.0,
+                "avg_local_ms": round(avg_local, 3),
+                "avg_llm_ms": round(avg_llm, 1),
+                "latency_saved_ms": round(local * max(avg_llm - avg_local, 0.0), 1)
+            })
+        return reports
+
+    def close(self) -> None:
+        with self._lock:
+            workers = list(self._workers.values())
+            self._workers.clear()
+        for process, inbox in workers:
+            inbox.put(None)
+        for process, _ in workers + self._stopped:
+            process.join()
+        self._outbox.put(None)
+        self._collector.join()
@@ -4,6 +4,7 @@ import os
 import time
 from dotenv import load_dotenv
 from google import genai
+from utils.tracing import trace_span, annotate_root
 
 load_dotenv()
 
@@ -48,24 +49,31 @@ class GeminiClient:
 
         full_prompt = f"{system_prompt.strip()}\n\nUser:\n{user_prompt.strip()}"
 
-        for attempt in range(self.max_retries):
-            try:
-                response = self.client.models.generate_content(
-                    model=self.model,
-                    contents=full_prompt,
-                    config={"max_output_tokens": max_output_tokens}
-                )
-
-                # Extract output text safely
-                result = self._extract_text(response)
-                if result:
-                    return result.strip()
-
-            except Exception as e:
-                print(f"⚠️ Gemini request failed (attempt {attempt+1}): {e}")
-                time.sleep(1.2)  # minor cooldown
-
-        return ""  # fallback if all attempts fail
+        with trace_span("gemini.generate", model=self.model, max_retries=self.max_retries) as span:
+            for attempt in range(self.max_retries):
+                try:
+                    with trace_span("gemini.attempt", attempt=attempt + 1):
+                        response = self.client.models.generate_content(
+                            model=self.model,
+                            contents=full_prompt,
+                            config={"max_output_tokens": max_output_tokens}
+                        )
+
+                    # Extract output text safely
+                    result = self._extract_text(response)
+                    if result:
+                        span.set(retries=attempt, ok=True)
+                        annotate_root(llm_retries=attempt)
+                        return result.strip()
+
+                except Exception as e:
+                    print(f"⚠️ Gemini request failed (attempt {attempt+1}): {e}")
+                    with trace_span("gemini.sleep", seconds=1.2):
+                        time.sleep(1.2)  # minor cooldown
+
+            span.set(retries=self.max_retries, ok=False)
+            annotate_root(llm_retries=self.max_retries)
+            return ""  # fallback if all attempts fail
 
     @staticmethod
     def _extract_text(response) -> str:
@@ -0,0 +1,256 @@
+# tools/replay.py
+
+"""
+Session replay load-testing harness.
+
+Drives recorded conversations (see tools/session_recorder.py) against an
+Orchestrator wired to a local store and the fake Gemini stand-in, then
+reports throughput, per-agent latency percentiles, error and fallback rates.
+
+Usage:
+    python -m tools.replay sessions.jsonl --concurrency 16 --speedup 60
+    python -m tools.replay sessions.jsonl --store mongo --mongo-uri mongodb://localhost:27017
+"""
+
+import argparse
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from tools.session_recorder import load_sessions
+from utils.tracing import Tracer, set_tracer
+
+
+WORKER_START_TIMEOUT_S = 120  # --workers: pool startup is excluded from the measured run
+
+# ---------------- Wiring ---------------- #
+
+def make_orchestrator(store: str = "memory", mongo_uri: str = None, db_name: str = "trackr_replay",
+                      llm_latency_ms: float = 800, llm_failure_rate: float = 0.0):
+    """Build an Orchestrator on local stand-ins. Module-level so worker processes can call it."""
+    from main import Orchestrator
+    from memory.memory_service import MemoryService
+    from tools.stand_ins import InMemoryMongoService, FakeGeminiClient, FakeAuthService
+
+    if store == "mongo":
+        from database.mongo_service import MongoService
+        db = MongoService(mongo_uri or "mongodb://localhost:27017", db_name)
+    else:
+        db = InMemoryMongoService()
+
+    memory = MemoryService(db)
+    llm = FakeGeminiClient(latency_ms=llm_latency_ms, jitter_ms=llm_latency_ms / 4, failure_rate=llm_failure_rate)
+    return Orchestrator(memory=memory, llm=llm, auth=FakeAuthService(memory))
+
+
+def seed_onboarded(memory, email: str) -> None:
+    """Recordings may start mid-life; mark such users as already onboarded."""
+    user = memory.get_user(email)
+    profile = user["profile"]
+    profile.update({"name": "Replay User", "age": 30, "gender": "prefer not to say"})
+    memory.update_profile(email, profile)
+    memory.db.users.update_one({"email": email}, {"$set": {"onboarding_status": {"step": 2, "completed": True}}})
+
+
+def seed_user(orch, email: str) -> None:
+    seed_onboarded(orch.memory, email)
+
+
+def replay_email(user_hash: str) -> str:
+    return f"{user_hash}@replay.local"
+
+
+# ---------------- Measurement ---------------- #
+
+class RootSpanCollector:
+    """Tracing exporter that keeps one compact record per `Orchestrator.handle` call."""
+
+    def __init__(self):
+        self.records = []
+        self._lock = threading.Lock()
+
+    def export(self, span) -> None:
+        if span.parent_id is not None or span.name != "orchestrator.handle":
+            return
+        attrs = span.attributes
+        self.add(attrs.get("agent", "error"), span.duration_ms, bool(attrs.get("fallback")), "error" in attrs)
+
+    def add(self, agent: str, latency_ms: float, fallback: bool, error: bool) -> None:
+        with self._lock:
+            self.records.append((agent, latency_ms, fallback, error))
+
+
+def percentile(values: list, pct: float) -> float:
+    """Nearest-rank percentile."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def summarize(records: list, wall_s: float) -> dict:
+    by_agent = {}
+    for agent, latency_ms, fallback, error in records:
+        stats = by_agent.setdefault(agent, {"latencies": [], "fallbacks": 0, "errors": 0})
+        stats["latencies"].append(latency_ms)
+        stats["fallbacks"] += fallback
+        stats["errors"] += error
+
+    total = len(records)
+    return {
+        "requests": total,
+        "wall_seconds": round(wall_s, 3),
+        "throughput_rps": round(total / wall_s, 2) if wall_s else 0.0,
+        "error_rate": round(sum(r[3] for r in records) / total, 4) if total else 0.0,
+        "fallback_rate": round(sum(r[2] for r in records) / total, 4) if total else 0.0,
+        "agents": {
+            agent: {
+                "count": len(s["latencies"]),
+                "p50_ms": round(percentile(s["latencies"], 50), 2),
+                "p95_ms": round(percentile(s["latencies"], 95), 2),
+                "p99_ms": round(percentile(s["latencies"], 99), 2),
+                "error_rate": round(s["errors"] / len(s["latencies"]), 4),
+                "fallback_rate": round(s["fallbacks"] / len(s["latencies"]), 4)
+            }
+            for agent, s in sorted(by_agent.items())
+        }
+    }
+
+
+def print_report(report: dict) -> None:
+    print(f"\n📈 Replayed {report['requests']} requests in {report['wall_seconds']}s "
+          f"→ {report['throughput_rps']} req/s")
+    print(f"   errors: {report['error_rate']:.2%}   fallbacks: {report['fallback_rate']:.2%}\n")
+    print(f"{'agent':<14}{'count':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>9}{'fallback':>10}")
+    for agent, s in report["agents"].items():
+        print(f"{agent:<14}{s['count']:>8}{s['p50_ms']:>10}{s['p95_ms']:>10}{s['p99_ms']:>10}"
+              f"{s['error_rate']:>9.2%}{s['fallback_rate']:>10.2%}")
+    print()
+
+
+def print_serve_report(serve_report: list) -> None:
+    if not serve_report:
+        return
+    print(f"{'agent':<20}{'requests':>10}{'local':>8}{'share':>9}{'shed':>7}{'avg local ms':>14}{'saved s':>10}")
+    for s in serve_report:
+        print(f"{s['agent']:<20}{s['requests']:>10}{s['served_locally']:>8}{s['local_share']:>9.2%}"
+              f"{s['shed']:>7}{s['avg_local_ms']:>14}{s['latency_saved_ms'] / 1000:>10.1f}")
+    print()
+
+
+def print_admission_report(report: dict | None) -> None:
+    if not report:
+        return
+    print(f"🚦 Admission control: shed {sum(report['shed'].values())} of "
+          f"{sum(report['shed'].values()) + sum(report['admitted'].values())} LLM-bound requests "
+          f"{report['shed_reasons']}")
+    print(f"   recent p95 LLM latency {report['p95_latency_ms']} ms · "
+          f"avg queue wait {report['avg_queue_wait_ms']} ms\n")
+
+
+# ---------------- Replay ---------------- #
+
+def replay(orch, sessions: dict, concurrency: int = 8, speedup: float = 0.0, collector=None) -> float:
+    """
+    Each user's stream runs in order on one thread (onboarding and log appends
+    depend on it); up to `concurrency` streams run at once. With speedup > 0,
+    messages are paced at their recorded offsets divided by speedup; 0 = flat out.
+    `orch` is an Orchestrator, or a WorkerPool — then latency is measured here,
+    including queueing, and recorded on `collector`. Returns wall-clock seconds.
+    """
+    pooled = hasattr(orch, "submit")
+    t0 = min(datetime.fromisoformat(events[0]["timestamp"]) for events in sessions.values())
+    start = time.perf_counter()
+
+    def run_stream(item):
+        user_hash, events = item
+        email = replay_email(user_hash)
+        if not _starts_in_onboarding(events[0]):
+            orch.call(email, seed_user) if pooled else seed_user(orch, email)
+
+        for event in events:
+            if speedup > 0:
+                offset = (datetime.fromisoformat(event["timestamp"]) - t0).total_seconds() / speedup
+                delay = start + offset - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            if pooled:
+                _handle_pooled(orch, email, event["message"], collector)
+                continue
+            try:
+                orch.handle(email, event["message"])
+            except Exception:
+                pass  # counted through the root span's error attribute
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(run_stream, sessions.items()))
+
+    return time.perf_counter() - start
+
+
+def _starts_in_onboarding(event: dict) -> bool:
+    if "onboarding_step" in event:
+        return event["onboarding_step"] is not None
+    return event.get("agent") == "system"  # older recordings: best guess from the reply
+
+
+def _handle_pooled(pool, email: str, message: str, collector: RootSpanCollector) -> None:
+    started = time.perf_counter()
+    future = pool.submit(email, message)
+    try:
+        agent, error = future.result()["agent"], False
+    except Exception:
+        agent, error = "error", True
+    latency_ms = (time.perf_counter() - started) * 1000
+    collector.add(agent, latency_ms, bool(future.meta.get("fallback")), error)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded Trackr sessions against local stand-ins.")
+    parser.add_argument("recording", help="JSONL file written by SessionRecorder")
+    parser.add_argument("--concurrency", type=int, default=8, help="user streams replayed at once")
+    parser.add_argument("--speedup", type=float, default=0.0, help="time compression factor (0 = no pacing)")
+    parser.add_argument("--store", choices=["memory", "mongo"], default="memory")
+    parser.add_argument("--mongo-uri", default="mongodb://localhost:27017")
+    parser.add_argument("--db-name", default="trackr_replay")
+    parser.add_argument("--llm-latency-ms", type=float, default=800)
+    parser.add_argument("--llm-failure-rate", type=float, default=0.0)
+    parser.add_argument("--workers", type=int, default=0,
+                        help="serve through a WorkerPool of N processes (0 = in-process Orchestrator)")
+    args = parser.parse_args()
+
+    sessions = load_sessions(args.recording)
+    collector = RootSpanCollector()
+    factory_kwargs = {
+        "store": args.store, "mongo_uri": args.mongo_uri, "db_name": args.db_name,
+        "llm_latency_ms": args.llm_latency_ms, "llm_failure_rate": args.llm_failure_rate
+    }
+
+    if args.workers:
+        from services.worker_pool import WorkerPool
+        orch = WorkerPool(make_orchestrator, args.workers, factory_kwargs=factory_kwargs, trace_roots=True)
+        started = time.perf_counter()
+        if not orch.wait_ready(timeout=WORKER_START_TIMEOUT_S):
+            orch.close()
+            raise SystemExit(f"❌ Workers not ready after {WORKER_START_TIMEOUT_S}s")
+        print(f"\n⚙️ {args.workers} workers ready in {time.perf_counter() - started:.1f}s (not counted below)")
+    else:
+        set_tracer(Tracer(collector, sample_rate=1.0))
+        orch = make_orchestrator(**factory_kwargs)
+
+    try:
+        wall_s = replay(orch, sessions, args.concurrency, args.speedup, collector)
+        print_report(summarize(collector.records, wall_s))
+        print_serve_report(orch.serve_report())
+        if not args.workers:
+            print_admission_report(orch.admission_report())
+    finally:
+        if args.workers:
+            orch.close()
+
+
+if __name__ == "__main__":
+    main()
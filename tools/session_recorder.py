@@ -0,0 +1,94 @@
+# tools/session_recorder.py
+
+import os
+import re
+import json
+import hashlib
+import threading
+from datetime import datetime
+
+
+EMAIL_PATTERN = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
+PHONE_PATTERN = re.compile(r"\+?\d[\d\s().-]{7,}\d")
+
+# Reply sent after onboarding step 0 — the message that triggered it is the user's name.
+NAME_STEP_REPLY = "Nice to meet you"
+
+
+class SessionRecorder:
+    """
+    Captures anonymized conversation streams at `Orchestrator.handle`
+    for the replay load-testing harness (tools/replay.py).
+
+    Each JSONL line holds:
+    - user:      hash of the email salted with a secret (stable within one salt;
+                 without the salt it can't be matched to a list of addresses)
+    - message:   the message, with emails / phone numbers / names scrubbed
+    - timestamp: when the message arrived
+    - agent:     which agent answered
+    - onboarding_step: onboarding step the message answered, None once onboarded
+                       (lets replay seed already-onboarded users)
+
+    Enable with SESSION_RECORD_PATH and SESSION_RECORD_SALT in .env — recording
+    is refused without a salt, and the salt is never written to the recording.
+    """
+
+    def __init__(self, path: str, salt: str):
+        if not salt:
+            raise ValueError("SessionRecorder needs a secret salt, or user hashes can be reversed")
+        self.path = path
+        self.salt = salt
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    @classmethod
+    def from_env(cls):
+        path = os.getenv("SESSION_RECORD_PATH")
+        if not path:
+            return None
+        salt = os.getenv("SESSION_RECORD_SALT")
+        if not salt:
+            print("⚠️ SESSION_RECORD_PATH is set but SESSION_RECORD_SALT is not — session recording disabled")
+            return None
+        return cls(path, salt)
+
+    def hash_user(self, email: str) -> str:
+        return hashlib.sha256(f"{self.salt}{email}".encode("utf-8")).hexdigest()[:16]
+
+    def anonymize(self, message: str, reply: dict) -> str:
+        if reply.get("agent") == "system" and reply.get("message", "").startswith(NAME_STEP_REPLY):
+            return "Alex"
+
+        message = EMAIL_PATTERN.sub("someone@example.com", message)
+        return PHONE_PATTERN.sub("0000000000", message)
+
+    def record(self, email: str, message: str, reply: dict, received_at: datetime,
+               onboarding_step: int | None = None) -> None:
+        line = json.dumps({
+            "user": self.hash_user(email),
+            "message": self.anonymize(message, reply),
+            "timestamp": received_at.isoformat(),
+            "agent": reply.get("agent"),
+            "onboarding_step": onboarding_step
+        }, ensure_ascii=False)
+
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+
+def load_sessions(path: str) -> dict:
+    """Read a recording back as {user_hash: [events in arrival order]}."""
+    sessions = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                event = json.loads(line)
+                sessions.setdefault(event["user"], []).append(event)
+
+    for events in sessions.values():
+        events.sort(key=lambda e: e["timestamp"])
+    return sessions
@@ -0,0 +1,301 @@
+# tools/stand_ins.py
+
+"""
+Local stand-ins for MongoDB, Gemini and the OTP mailer.
+
+They keep the same method surface the agents and services use, so an
+Orchestrator can be wired without credentials or network access —
+for the replay harness, load benchmarks and local development.
+"""
+
+import copy
+import json
+import random
+import threading
+import time
+from datetime import datetime
+
+from utils.tracing import trace_span, annotate_root
+
+
+# ---------------- MongoDB ---------------- #
+
+def _get_path(doc: dict, path: str):
+    for key in path.split("."):
+        if not isinstance(doc, dict) or key not in doc:
+            return None
+        doc = doc[key]
+    return doc
+
+
+def _parent_for(doc: dict, path: str):
+    keys = path.split(".")
+    for key in keys[:-1]:
+        doc = doc.setdefault(key, {})
+    return doc, keys[-1]
+
+
+def _matches(doc: dict, query: dict) -> bool:
+    for path, condition in query.items():
+        value = _get_path(doc, path)
+        if isinstance(condition, dict) and any(k.startswith("$") for k in condition):
+            for op, operand in condition.items():
+                if op == "$lte" and not (value is not None and value <= operand):
+                    return False
+                if op == "$lt" and not (value is not None and value < operand):
+                    return False
+                if op == "$gte" and not (value is not None and value >= operand):
+                    return False
+                if op == "$gt" and not (value is not None and value > operand):
+                    return False
+                if op == "$in" and value not in operand:
+                    return False
+                if op == "$exists" and (value is not None) != operand:
+                    return False
+        elif value != condition:
+            return False
+    return True
+
+
+class UpdateResult:
+    def __init__(self, matched_count: int, upserted_id=None):
+        self.matched_count = matched_count
+        self.modified_count = matched_count
+        self.upserted_id = upserted_id
+
+
+class InMemoryCollection:
+    """Subset of the pymongo Collection API, backed by a list of dicts."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._docs = []
+        self._lock = threading.RLock()
+        self._next_id = 1
+
+    def create_index(self, keys, **kwargs) -> str:
+        return "_".join(f"{k}_{d}" for k, d in keys) if isinstance(keys, list) else str(keys)
+
+    def insert_one(self, doc: dict):
+        with self._lock:
+            doc.setdefault("_id", self._next_id)
+            self._next_id += 1
+            self._docs.append(copy.deepcopy(doc))
+        return UpdateResult(0, doc["_id"])
+
+    def find_one(self, query: dict = None, projection: dict = None):
+        with self._lock:
+            for doc in self._docs:
+                if _matches(doc, query or {}):
+                    return copy.deepcopy(doc)
+        return None
+
+    def find(self, query: dict = None, projection: dict = None, sort=None, limit: int = 0, **kwargs) -> list:
+        with self._lock:
+            docs = [copy.deepcopy(d) for d in self._docs if _matches(d, query or {})]
+        for key, direction in reversed(sort or []):
+            docs.sort(key=lambda d: (_get_path(d, key) is None, _get_path(d, key)), reverse=direction < 0)
+        return docs[:limit] if limit else docs
+
+    def count_documents(self, query: dict) -> int:
+        with self._lock:
+            return sum(1 for d in self._docs if _matches(d, query))
+
+    def update_one(self, query: dict, update: dict, upsert: bool = False) -> UpdateResult:
+        with self._lock:
+            for doc in self._docs:
+                if _matches(doc, query):
+                    self._apply(doc, update)
+                    return UpdateResult(1)
+
+            if not upsert:
+                return UpdateResult(0)
+            doc = {k: v for k, v in query.items() if not isinstance(v, dict)}
+            self._apply(doc, update)
+            return self.insert_one(doc)
+
+    def update_many(self, query: dict, update: dict) -> UpdateResult:
+        with self._lock:
+            matched = [d for d in self._docs if _matches(d, query)]
+            for doc in matched:
+                self._apply(doc, update)
+        return UpdateResult(len(matched))
+
+    def aggregate(self, pipeline: list, **kwargs):
+        """Supports the $match / $project / $unwind stages; yields documents one at a time."""
+        with self._lock:
+            docs = [copy.deepcopy(d) for d in self._docs]
+
+        for stage in pipeline:
+            (op, spec), = stage.items()
+            if op == "$match":
+                docs = [d for d in docs if _matches(d, spec)]
+            elif op == "$project":
+                docs = [
+                    {key: _get_path(d, value[1:]) if isinstance(value, str) else _get_path(d, key)
+                     for key, value in spec.items() if value}
+                    for d in docs
+                ]
+            elif op == "$unwind":
+                field = spec[1:] if isinstance(spec, str) else spec["path"][1:]
+                docs = [{**d, field: item} for d in docs for item in (_get_path(d, field) or [])]
+            else:
+                raise NotImplementedError(f"Unsupported aggregation stage: {op}")
+        yield from docs
+
+    def delete_one(self, query: dict) -> None:
+        with self._lock:
+            for i, doc in enumerate(self._docs):
+                if _matches(doc, query):
+                    del self._docs[i]
+                    return
+
+    def delete_many(self, query: dict) -> None:
+        with self._lock:
+            self._docs = [d for d in self._docs if not _matches(d, query)]
+
+    @staticmethod
+    def _apply(doc: dict, update: dict) -> None:
+        for op, fields in update.items():
+            for path, value in fields.items():
+                parent, key = _parent_for(doc, path)
+                if op in ("$set", "$setOnInsert"):
+                    parent[key] = copy.deepcopy(value)
+                elif op == "$inc":
+                    parent[key] = parent.get(key, 0) + value
+                elif op == "$unset":
+                    parent.pop(key, None)
+                elif op == "$push":
+                    parent.setdefault(key, []).append(copy.deepcopy(value))
+                elif op == "$pull":
+                    condition = value if isinstance(value, dict) else None
+                    parent[key] = [
+                        item for item in parent.get(key, [])
+                        if not (_matches(item, condition) if condition is not None else item == value)
+                    ]
+                else:
+                    raise NotImplementedError(f"Unsupported update operator: {op}")
+
+
+class InMemoryMongoService:
+    """Drop-in for `MongoService` — same attributes (db, users) and methods."""
+
+    def __init__(self):
+        self.db = _InMemoryDatabase()
+        self.users = self.db["users"]
+
+    def get_user(self, email):
+        user = self.users.find_one({"email": email})
+
+        if not user:
+            user = {
+                "email": email,
+                "profile": {
+                    "name": None,
+                    "age": None,
+                    "gender": None,
+                    "fitness_level": "beginner",
+                    "diet_type": "general",
+                    "goal": None,
+                    "equipment": [],
+                },
+                "logs": {"meals": [], "workouts": [], "mood": []},
+                "created_at": datetime.utcnow(),
+            }
+            self.users.insert_one(user)
+
+        return user
+
+    def update_profile(self, email, profile):
+        self.users.update_one({"email": email}, {"$set": {"profile": profile}})
+
+    def append_log(self, email, log_type, entry):
+        self.users.update_one({"email": email}, {"$push": {f"logs.{log_type}": entry}})
+
+
+class _InMemoryDatabase(dict):
+    def __missing__(self, name):
+        collection = self[name] = InMemoryCollection(name)
+        return collection
+
+    def __getattr__(self, name):
+        return self[name]
+
+
+# ---------------- Gemini ---------------- #
+
+FAKE_REPLIES = {
+    '"workout_name"': {
+        "workout_name": "Stand-in Circuit",
+        "duration": "20 minutes",
+        "intensity": "beginner",
+        "steps": ["March in place — 3 minutes", "3 x 12 squats", "3 x 8 push-ups", "Stretch — 4 minutes"],
+        "tips": "Breathe steadily and keep the pace comfortable."
+    },
+    '"meal_log_entry"': {
+        "meal_log_entry": "stand-in meal",
+        "estimated_calories": None,
+        "nutrition_type": "balanced",
+        "suggested_improvement": "Add a handful of greens next time."
+    },
+    '"mood_acknowledgement"': {
+        "mood_acknowledgement": "Thanks for sharing how you feel.",
+        "journal_prompt": "What is one thing you need right now?",
+        "optional_breathing_or_grounding": "Take one slow breath in for 4, out for 6.",
+        "supportive_message": "Checking in is already a good step."
+    }
+}
+
+
+class FakeGeminiClient:
+    """
+    Same `generate()` contract as GeminiClient: returns text, or "" when all
+    attempts failed. Latency and failure rate are configurable so the
+    replay harness can reproduce slow or flaky upstream behaviour.
+    """
+
+    def __init__(self, latency_ms: float = 800, jitter_ms: float = 200, failure_rate: float = 0.0, seed=None):
+        self.model = "fake-gemini"
+        self.max_retries = 1
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.failure_rate = failure_rate
+        self._random = random.Random(seed)
+
+    def generate(self, system_prompt: str, user_prompt: str, max_output_tokens: int = 512,
+                 require_json: bool = False) -> str:
+        with trace_span("gemini.generate", model=self.model, max_retries=self.max_retries) as span:
+            delay_ms = max(0.0, self._random.gauss(self.latency_ms, self.jitter_ms))
+            with trace_span("gemini.attempt", attempt=1):
+                time.sleep(delay_ms / 1000)
+
+            if self._random.random() < self.failure_rate:
+                span.set(retries=self.max_retries, ok=False)
+                annotate_root(llm_retries=self.max_retries)
+                return ""
+
+            span.set(retries=0, ok=True)
+            annotate_root(llm_retries=0)
+            for marker, reply in FAKE_REPLIES.items():
+                if marker in system_prompt:
+                    return json.dumps(reply)
+            return "Stand-in reply."
+
+
+# ---------------- Auth ---------------- #
+
+class FakeAuthService:
+    """Accepts a fixed OTP and never sends email."""
+
+    def __init__(self, memory_service=None, otp: str = "000000"):
+        self.memory = memory_service
+        self.otp = otp
+
+    def start_login(self, email: str) -> bool:
+        return True
+
+    def verify(self, email: str, otp_attempt: str) -> bool:
+        return otp_attempt == self.otp
+
+    def has_pending(self, email: str) -> bool:
+        return True
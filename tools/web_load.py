@@ -0,0 +1,127 @@
+# tools/web_load.py
+
+"""
+Load test for the web front end, on local stand-ins.
+
+Starts web_app in-process with the in-memory Mongo, fake Gemini and fixed
+OTP, then drives it over HTTP with gradio_client: every simulated session
+logs in, finishes onboarding and sends a mix of chat messages. Each step of
+--sessions is run in turn and reported with per-request latency (first
+streamed chunk and full reply), throughput, and whether p95 stayed under
+the SLO — the largest such step is the measured session capacity.
+
+Usage:
+    python -m tools.web_load --sessions 10 25 50 100 --messages 5 --slo-ms 3000
+"""
+
+import argparse
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from tools.replay import percentile
+
+
+ONBOARDING = ["Alex", "30", "prefer not to say"]
+MESSAGES = [
+    "I ate rice, dal and a salad for lunch",
+    "Give me a 20 minute workout",
+    "I feel stressed about work and can't focus",
+    "Show my progress summary",
+    "I need a quick exercise for my back after sitting all day",
+    "I feel okay today",
+]
+
+
+def run_session(url: str, index: int, messages: int, latencies: list, lock: threading.Lock) -> int:
+    from gradio_client import Client
+
+    client = Client(url, verbose=False)
+    client.predict(f"load{index}@web.local", api_name="/send_code")
+    client.predict("000000", api_name="/verify")
+
+    rng = random.Random(index)
+    script = ONBOARDING + [rng.choice(MESSAGES) for _ in range(messages)]
+    errors = 0
+    for text in script:
+        started = time.perf_counter()
+        first_ms = None
+        try:
+            job = client.submit(text, api_name="/respond")
+            for _ in job:
+                if first_ms is None:
+                    first_ms = (time.perf_counter() - started) * 1000
+            job.result()
+        except Exception:
+            errors += 1
+            continue
+        total_ms = (time.perf_counter() - started) * 1000
+        with lock:
+            latencies.append((first_ms or total_ms, total_ms))
+    return errors
+
+
+def run_step(url: str, sessions: int, messages: int) -> dict:
+    latencies, lock = [], threading.Lock()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=sessions) as pool:
+        errors = sum(pool.map(lambda i: run_session(url, i, messages, latencies, lock), range(sessions)))
+    wall_s = time.perf_counter() - started
+
+    first, total = [l[0] for l in latencies], [l[1] for l in latencies]
+    return {
+        "sessions": sessions,
+        "requests": len(total),
+        "errors": errors,
+        "throughput_rps": round(len(total) / wall_s, 2) if wall_s else 0.0,
+        "first_chunk_p50_ms": round(percentile(first, 50), 1),
+        "p50_ms": round(percentile(total, 50), 1),
+        "p95_ms": round(percentile(total, 95), 1),
+        "p99_ms": round(percentile(total, 99), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure web front-end capacity on local stand-ins.")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[10, 25, 50])
+    parser.add_argument("--messages", type=int, default=5, help="chat messages per session after onboarding")
+    parser.add_argument("--concurrency-limit", type=int, default=16)
+    parser.add_argument("--queue-size", type=int, default=1024)
+    parser.add_argument("--llm-latency-ms", type=float, default=800)
+    parser.add_argument("--slo-ms", type=float, default=3000, help="p95 latency a step must stay under")
+    parser.add_argument("--port", type=int, default=7861)
+    args = parser.parse_args()
+
+    os.environ.setdefault("GRADIO_ANALYTICS_ENABLED", "False")
+    from web_app import ChatFrontend, build_orchestrator
+
+    frontend = ChatFrontend(build_orchestrator(True, args.llm_latency_ms), args.concurrency_limit)
+    demo = frontend.build(queue_size=args.queue_size)
+    demo.launch(server_port=args.port, prevent_thread_lock=True, quiet=True)
+    url = f"http://127.0.0.1:{args.port}/"
+
+    print(f"\n🌐 Concurrency limit {args.concurrency_limit}, fake LLM {args.llm_latency_ms:.0f} ms, "
+          f"SLO p95 < {args.slo_ms:.0f} ms\n")
+    print(f"{'sessions':>9}{'requests':>10}{'errors':>8}{'req/s':>8}{'first p50':>11}"
+          f"{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}  SLO")
+
+    capacity = 0
+    try:
+        for sessions in args.sessions:
+            s = run_step(url, sessions, args.messages)
+            ok = s["p95_ms"] < args.slo_ms and not s["errors"]
+            if ok:
+                capacity = sessions
+            print(f"{s['sessions']:>9}{s['requests']:>10}{s['errors']:>8}{s['throughput_rps']:>8}"
+                  f"{s['first_chunk_p50_ms']:>11}{s['p50_ms']:>9}{s['p95_ms']:>9}{s['p99_ms']:>9}  "
+                  f"{'✅' if ok else '❌'}")
+    finally:
+        demo.close()
+
+    print(f"\n📈 Concurrent session capacity within SLO: {capacity or 'below ' + str(args.sessions[0])}\n")
+
+
+if __name__ == "__main__":
+    main()
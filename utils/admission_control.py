@@ -0,0 +1,145 @@
+# utils/admission_control.py
+
+"""
+Load-aware admission control for LLM calls.
+
+Before building a prompt an agent asks admit(); when any signal is over
+its threshold the answer is no and the agent serves its deterministic
+fallback straight away instead of queueing behind everyone else. A yes
+reserves an in-flight slot under the same lock as the check, so a burst
+can't all pass the max_inflight test before any of it is counted. The
+Gemini call then goes through track(), which takes over the reservation,
+optionally caps how many calls run at once (the rest queue), and records
+queue wait and call latency over a sliding time window; an admitted
+caller that ends up not calling the LLM hands the slot back with release(). Samples age out of the window, so once
+load drops the next request probes the LLM again.
+
+Configured through .env:
+    ADMISSION_CONTROL=1               enable
+    ADMISSION_MAX_INFLIGHT            calls waiting + running before shedding (default 32)
+    ADMISSION_MAX_QUEUE_WAIT_MS       average recent queue wait before shedding (default 1000)
+    ADMISSION_MAX_LATENCY_MS          p95 recent LLM latency before shedding (default 8000)
+    ADMISSION_MAX_CONCURRENT          LLM calls running at once, 0 = unbounded (default 0)
+    ADMISSION_WINDOW_S                sliding window for wait / latency samples (default 30)
+"""
+
+import os
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+
+
+MIN_SAMPLES = 5  # fewer recent calls than this say nothing about latency
+
+
+class AdmissionController:
+    def __init__(self, max_inflight: int = 32, max_queue_wait_ms: float = 1000, max_latency_ms: float = 8000,
+                 max_concurrent: int = 0, window_s: float = 30.0):
+        self.max_inflight = max_inflight
+        self.max_queue_wait_ms = max_queue_wait_ms
+        self.max_latency_ms = max_latency_ms
+        self.window_s = window_s
+
+        self._slots = threading.BoundedSemaphore(max_concurrent) if max_concurrent else None
+        self._lock = threading.Lock()
+        self._samples = deque()      # (finished_at, queue_wait_ms, latency_ms)
+        self._inflight = 0
+        self._reserved = threading.local()  # admit() reservations held by this thread, not yet tracked
+        self.admitted = Counter()
+        self.shed = Counter()
+        self.shed_reasons = Counter()
+
+    @classmethod
+    def from_env(cls):
+        if os.getenv("ADMISSION_CONTROL", "").lower() not in ("1", "true", "yes"):
+            return None
+        return cls(
+            max_inflight=int(os.getenv("ADMISSION_MAX_INFLIGHT", "32")),
+            max_queue_wait_ms=float(os.getenv("ADMISSION_MAX_QUEUE_WAIT_MS", "1000")),
+            max_latency_ms=float(os.getenv("ADMISSION_MAX_LATENCY_MS", "8000")),
+            max_concurrent=int(os.getenv("ADMISSION_MAX_CONCURRENT", "0")),
+            window_s=float(os.getenv("ADMISSION_WINDOW_S", "30"))
+        )
+
+    # ---------------- Decisions ---------------- #
+
+    def admit(self, agent: str) -> bool:
+        """True → go ahead and call the LLM (an in-flight slot is reserved); False → serve the local fallback."""
+        with self._lock:
+            reason = self._overload_reason(time.monotonic())
+            if reason:
+                self.shed[agent] += 1
+                self.shed_reasons[reason] += 1
+                return False
+            self.admitted[agent] += 1
+            self._inflight += 1
+        self._reserved.count = self._held() + 1
+        return True
+
+    def release(self) -> None:
+        """Give back a slot reserved by admit() that track() never took over (no-op otherwise)."""
+        if not self._held():
+            return
+        self._reserved.count -= 1
+        with self._lock:
+            self._inflight -= 1
+
+    def _held(self) -> int:
+        return getattr(self._reserved, "count", 0)
+
+    def _overload_reason(self, now: float) -> str | None:
+        while self._samples and now - self._samples[0][0] > self.window_s:
+            self._samples.popleft()
+
+        if self._inflight >= self.max_inflight:
+            return "inflight"
+        if len(self._samples) < MIN_SAMPLES:
+            return None
+        if sum(s[1] for s in self._samples) / len(self._samples) > self.max_queue_wait_ms:
+            return "queue_wait"
+        if self._p95_latency() > self.max_latency_ms:
+            return "latency"
+        return None
+
+    def _p95_latency(self) -> float:
+        latencies = sorted(s[2] for s in self._samples)
+        return latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] if latencies else 0.0
+
+    # ---------------- Measurement ---------------- #
+
+    @contextmanager
+    def track(self):
+        """Wrap one LLM call: queue for a slot (if capped), then time the call."""
+        if self._held():
+            self._reserved.count -= 1  # take over the slot admit() reserved
+        else:
+            with self._lock:
+                self._inflight += 1  # unadmitted caller, e.g. the plan pre-generation job
+        queued = time.perf_counter()
+        if self._slots:
+            self._slots.acquire()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            finished = time.perf_counter()
+            if self._slots:
+                self._slots.release()
+            with self._lock:
+                self._inflight -= 1
+                self._samples.append((time.monotonic(), (started - queued) * 1000, (finished - started) * 1000))
+
+    def report(self) -> dict:
+        with self._lock:
+            self._overload_reason(time.monotonic())  # age out old samples
+            waits = [s[1] for s in self._samples]
+            return {
+                "inflight": self._inflight,
+                "recent_calls": len(self._samples),
+                "avg_queue_wait_ms": round(sum(waits) / len(waits), 1) if waits else 0.0,
+                "p95_latency_ms": round(self._p95_latency(), 1),
+                "admitted": dict(self.admitted),
+                "shed": dict(self.shed),
+                "shed_reasons": dict(self.shed_reasons)
+            }
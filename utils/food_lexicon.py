@@ -0,0 +1,221 @@
+# utils/food_lexicon.py
+
+"""
+Local food lexicon for NutritionAgent.
+
+Meal descriptions are tokenized and matched against a word-level trie, so
+multi-word foods ("brown rice", "peanut butter") win over their parts and
+a whole description parses in microseconds. Each match maps to a canonical
+item and its food groups (vegetables, fruit, protein, fiber, grains, dairy,
+water, treats), which are stored on the meal log entry for analytics.
+"""
+
+import re
+
+
+# canonical name → food groups; extra spellings are listed in ALIASES
+FOODS = {
+    # Vegetables
+    "salad": ["vegetables"], "spinach": ["vegetables", "fiber"], "broccoli": ["vegetables", "fiber"],
+    "carrot": ["vegetables", "fiber"], "tomato": ["vegetables"], "cucumber": ["vegetables"],
+    "pepper": ["vegetables"], "onion": ["vegetables"], "cabbage": ["vegetables", "fiber"],
+    "cauliflower": ["vegetables", "fiber"], "peas": ["vegetables", "fiber", "protein"],
+    "green beans": ["vegetables", "fiber"], "kale": ["vegetables", "fiber"], "lettuce": ["vegetables"],
+    "mushroom": ["vegetables"], "zucchini": ["vegetables"], "eggplant": ["vegetables", "fiber"],
+    "potato": ["vegetables"], "sweet potato": ["vegetables", "fiber"], "corn": ["vegetables", "grains"],
+    "vegetables": ["vegetables", "fiber"], "okra": ["vegetables", "fiber"], "beetroot": ["vegetables", "fiber"],
+    "sabzi": ["vegetables"], "soup": ["vegetables", "water"],
+
+    # Fruit
+    "apple": ["fruit", "fiber"], "banana": ["fruit"], "orange": ["fruit", "fiber"], "berries": ["fruit", "fiber"],
+    "grapes": ["fruit"], "mango": ["fruit"], "pear": ["fruit", "fiber"], "watermelon": ["fruit", "water"],
+    "pineapple": ["fruit"], "kiwi": ["fruit", "fiber"], "papaya": ["fruit"], "avocado": ["fruit", "fiber"],
+    "fruit": ["fruit", "fiber"], "dates": ["fruit", "fiber"], "raisins": ["fruit"],
+
+    # Protein
+    "egg": ["protein"], "chicken": ["protein"], "fish": ["protein"], "salmon": ["protein"], "tuna": ["protein"],
+    "beef": ["protein"], "pork": ["protein"], "turkey": ["protein"], "shrimp": ["protein"], "mutton": ["protein"],
+    "tofu": ["protein"], "tempeh": ["protein", "fiber"], "paneer": ["protein", "dairy"],
+    "beans": ["protein", "fiber"], "lentils": ["protein", "fiber"], "dal": ["protein", "fiber"],
+    "chickpeas": ["protein", "fiber"], "chana": ["protein", "fiber"], "rajma": ["protein", "fiber"],
+    "hummus": ["protein", "fiber"], "nuts": ["protein", "fiber"], "almonds": ["protein", "fiber"],
+    "peanut butter": ["protein"], "seeds": ["protein", "fiber"], "protein shake": ["protein"],
+
+    # Grains
+    "rice": ["grains"], "brown rice": ["grains", "fiber"], "bread": ["grains"],
+    "whole wheat bread": ["grains", "fiber"], "pasta": ["grains"], "noodles": ["grains"],
+    "oats": ["grains", "fiber"], "oatmeal": ["grains", "fiber"], "quinoa": ["grains", "fiber", "protein"],
+    "roti": ["grains", "fiber"], "chapati": ["grains", "fiber"], "paratha": ["grains"], "naan": ["grains"],
+    "cereal": ["grains"], "granola": ["grains", "fiber"], "tortilla": ["grains"], "poha": ["grains"],
+    "upma": ["grains"], "idli": ["grains"], "dosa": ["grains"], "bagel": ["grains"], "couscous": ["grains"],
+    "sandwich": ["grains"], "wrap": ["grains"], "toast": ["grains"], "biryani": ["grains", "protein"],
+    "khichdi": ["grains", "protein", "fiber"],
+
+    # Dairy
+    "milk": ["dairy"], "yogurt": ["dairy", "protein"], "curd": ["dairy", "protein"], "cheese": ["dairy", "protein"],
+    "greek yogurt": ["dairy", "protein"], "buttermilk": ["dairy", "water"], "lassi": ["dairy"],
+
+    # Drinks
+    "water": ["water"], "coconut water": ["water"], "tea": ["water"], "green tea": ["water"],
+    "coffee": [], "juice": ["fruit"], "smoothie": ["fruit", "dairy"],
+
+    # Treats
+    "pizza": ["grains", "dairy", "treats"], "burger": ["grains", "protein", "treats"], "fries": ["treats"],
+    "chips": ["treats"], "cake": ["treats"], "cookies": ["treats"], "chocolate": ["treats"],
+    "ice cream": ["dairy", "treats"], "donut": ["treats"], "soda": ["treats"], "candy": ["treats"],
+    "samosa": ["treats"], "pastry": ["treats"], "dessert": ["treats"],
+}
+
+ALIASES = {
+    "eggs": "egg", "omelette": "egg", "omelet": "egg", "boiled egg": "egg", "scrambled eggs": "egg",
+    "veggies": "vegetables", "veg": "vegetables", "greens": "vegetables",
+    "carrots": "carrot", "tomatoes": "tomato", "potatoes": "potato", "sweet potatoes": "sweet potato",
+    "mushrooms": "mushroom", "peppers": "pepper", "onions": "onion",
+    "apples": "apple", "bananas": "banana", "oranges": "orange", "strawberries": "berries", "blueberries": "berries",
+    "pears": "pear", "mangoes": "mango", "nut": "nuts", "walnuts": "nuts", "cashews": "nuts",
+    "daal": "dal", "dhal": "dal", "lentil": "lentils", "chole": "chickpeas", "bean": "beans",
+    "yoghurt": "yogurt", "dahi": "curd", "noodle": "noodles", "spaghetti": "pasta", "macaroni": "pasta",
+    "chapatti": "chapati", "chapatis": "chapati", "rotis": "roti", "porridge": "oatmeal",
+    "sandwiches": "sandwich", "wraps": "wrap", "cookie": "cookies", "biscuits": "cookies",
+    "fried chicken": "chicken", "grilled chicken": "chicken", "cola": "soda", "coke": "soda",
+    "chai": "tea", "french fries": "fries", "sushi": "fish", "prawns": "shrimp",
+}
+
+# Words that carry no food meaning — they don't count against confidence.
+NEUTRAL_WORDS = {
+    "i", "ate", "had", "have", "having", "just", "some", "a", "an", "the", "and", "with", "of", "in", "on", "for",
+    "my", "at", "to", "plus", "side", "little", "bit", "lot", "lots", "bowl", "plate", "cup", "cups",
+    "glass", "glasses", "slice", "slices", "piece", "pieces", "serving", "portion", "handful", "meal", "food",
+    "breakfast", "lunch", "dinner", "snack", "brunch", "today", "tonight", "morning", "evening", "this",
+    "homemade", "fresh", "small", "big", "large", "two", "three", "one", "few", "also", "then", "after",
+}
+
+GROUPS = ["vegetables", "fruit", "protein", "fiber", "grains", "dairy", "water", "treats"]
+
+CONFIDENT = 0.8  # share of food words recognised before local templates are trusted
+
+
+class FoodTrie:
+    """Word-level trie: each node is a dict keyed by the next word; "$" holds the item name."""
+
+    def __init__(self):
+        self.root = {}
+
+    def insert(self, phrase: str, item: str) -> None:
+        node = self.root
+        for word in phrase.split():
+            node = node.setdefault(word, {})
+        node["$"] = item
+
+    def longest_match(self, tokens: list, start: int) -> tuple[str | None, int]:
+        """Return (item, words consumed) for the longest phrase starting at tokens[start]."""
+        node, best, length = self.root, None, 0
+        for i in range(start, len(tokens)):
+            node = node.get(tokens[i])
+            if node is None:
+                break
+            if "$" in node:
+                best, length = node["$"], i - start + 1
+        return best, length
+
+
+def _build_trie() -> FoodTrie:
+    trie = FoodTrie()
+    for name in FOODS:
+        trie.insert(name, name)
+    for alias, name in ALIASES.items():
+        trie.insert(alias, name)
+    return trie
+
+
+TRIE = _build_trie()
+TOKEN_PATTERN = re.compile(r"[a-z]+")
+
+
+def _singular(word: str) -> str:
+    if word.endswith("ies"):
+        return word[:-3] + "y"
+    if word.endswith("es") and word[:-2] in TRIE.root:
+        return word[:-2]
+    if word.endswith("s"):
+        return word[:-1]
+    return word
+
+
+def parse_meal(description: str) -> dict:
+    """
+    Split a meal description into known items and food groups.
+
+    Returns:
+        items:        canonical food names, in order of mention
+        food_groups:  sorted list of groups present
+        unknown:      food-looking words the lexicon doesn't know
+        confidence:   recognised food words / all food words (0.0 - 1.0)
+    """
+    tokens = TOKEN_PATTERN.findall(description.lower())
+    items, groups, unknown = [], set(), []
+    matched_words = 0
+
+    i = 0
+    while i < len(tokens):
+        item, length = TRIE.longest_match(tokens, i)
+        if item is None and tokens[i] not in NEUTRAL_WORDS:
+            tokens[i] = _singular(tokens[i])
+            item, length = TRIE.longest_match(tokens, i)
+
+        if item is not None:
+            if item not in items:
+                items.append(item)
+            groups.update(FOODS[item])
+            matched_words += length
+            i += length
+            continue
+
+        if tokens[i] not in NEUTRAL_WORDS:
+            unknown.append(tokens[i])
+        i += 1
+
+    food_words = matched_words + len(unknown)
+    return {
+        "items": items,
+        "food_groups": sorted(groups, key=GROUPS.index),
+        "unknown": unknown,
+        "confidence": round(matched_words / food_words, 2) if food_words else 0.0
+    }
+
+
+# ---------------- Templated Suggestions ---------------- #
+
+SUGGESTIONS = [
+    ("vegetables", "For a tiny upgrade, add a handful of vegetables or a side salad next time 🥦"),
+    ("protein", "Adding a source of protein — eggs, dal, yogurt or beans — would help keep you full longer 💪"),
+    ("fiber", "A little fiber would round this out — try whole grains, fruit or legumes 🌾"),
+    ("water", "Pair it with a glass of water to stay nicely hydrated 💧"),
+]
+
+
+def nutrition_type(groups: list) -> str:
+    present = set(groups)
+    if "treats" in present and len(present - {"treats"}) <= 1:
+        return "treat"
+    if {"vegetables", "protein"} <= present and present & {"grains", "fiber"}:
+        return "balanced"
+    if "protein" in present:
+        return "protein-rich"
+    if present & {"vegetables", "fruit"}:
+        return "plant-forward"
+    if "grains" in present:
+        return "carb-focused"
+    return "general"
+
+
+def suggest(parsed: dict, name: str) -> str | None:
+    """Local suggestion for a confidently parsed meal; None means ask the LLM."""
+    if not parsed["items"] or parsed["confidence"] < CONFIDENT:
+        return None
+
+    present = set(parsed["food_groups"])
+    for group, text in SUGGESTIONS:
+        if group not in present:
+            return f"Nice job logging your meal, {name} 🌿. {text}"
+    return f"Lovely balance in this meal, {name} 🌿 — vegetables, protein, fiber and water all showed up. Keep it going!"
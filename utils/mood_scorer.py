@@ -0,0 +1,122 @@
+# utils/mood_scorer.py
+
+"""
+Local sentiment / emotion scorer for mood check-ins.
+
+Words are looked up in a small valence-arousal lexicon (valence -1..1,
+arousal 0..1) with negation ("not happy") and intensifier ("really tired")
+handling, in the spirit of VADER. Everything is compiled at import, so
+scoring a message is a regex pass plus dict lookups — cheap enough to run
+on every message.
+"""
+
+import re
+
+
+# word → (valence, arousal, emotion)
+LEXICON = {
+    # Positive, energised
+    "happy": (0.7, 0.6, "joy"), "great": (0.7, 0.6, "joy"), "amazing": (0.9, 0.8, "joy"),
+    "awesome": (0.8, 0.7, "joy"), "excited": (0.7, 0.9, "joy"), "joyful": (0.8, 0.7, "joy"),
+    "good": (0.5, 0.4, "joy"), "fantastic": (0.9, 0.8, "joy"), "proud": (0.7, 0.6, "pride"),
+    "motivated": (0.6, 0.7, "pride"), "energetic": (0.6, 0.8, "joy"), "grateful": (0.7, 0.4, "gratitude"),
+    "thankful": (0.7, 0.4, "gratitude"), "hopeful": (0.6, 0.5, "hope"), "confident": (0.6, 0.6, "pride"),
+    "love": (0.8, 0.6, "joy"), "wonderful": (0.9, 0.6, "joy"), "better": (0.4, 0.4, "relief"),
+
+    # Positive, calm
+    "calm": (0.5, 0.1, "calm"), "relaxed": (0.6, 0.1, "calm"), "peaceful": (0.6, 0.1, "calm"),
+    "content": (0.5, 0.2, "calm"), "rested": (0.5, 0.2, "calm"), "fine": (0.2, 0.3, "calm"),
+    "okay": (0.1, 0.3, "calm"), "ok": (0.1, 0.3, "calm"), "relieved": (0.5, 0.3, "relief"),
+
+    # Negative, agitated
+    "stressed": (-0.6, 0.8, "stress"), "stress": (-0.5, 0.7, "stress"), "anxious": (-0.6, 0.8, "anxiety"),
+    "nervous": (-0.5, 0.7, "anxiety"), "worried": (-0.5, 0.6, "anxiety"), "overwhelmed": (-0.7, 0.8, "stress"),
+    "angry": (-0.7, 0.9, "anger"), "frustrated": (-0.6, 0.7, "anger"), "annoyed": (-0.4, 0.6, "anger"),
+    "irritated": (-0.4, 0.6, "anger"), "panicked": (-0.8, 0.9, "anxiety"), "scared": (-0.7, 0.8, "fear"),
+    "afraid": (-0.6, 0.7, "fear"), "restless": (-0.3, 0.7, "anxiety"), "tense": (-0.4, 0.7, "stress"),
+
+    # Negative, low energy
+    "sad": (-0.6, 0.3, "sadness"), "down": (-0.5, 0.2, "sadness"), "low": (-0.4, 0.2, "sadness"),
+    "depressed": (-0.8, 0.2, "sadness"), "lonely": (-0.6, 0.3, "sadness"), "unhappy": (-0.6, 0.3, "sadness"),
+    "tired": (-0.3, 0.1, "fatigue"), "exhausted": (-0.5, 0.2, "fatigue"), "drained": (-0.5, 0.1, "fatigue"),
+    "bored": (-0.3, 0.1, "boredom"), "bad": (-0.5, 0.4, "sadness"), "awful": (-0.8, 0.5, "sadness"),
+    "terrible": (-0.8, 0.5, "sadness"), "hopeless": (-0.8, 0.2, "sadness"), "meh": (-0.1, 0.2, "boredom"),
+    "upset": (-0.6, 0.6, "sadness"), "hurt": (-0.6, 0.5, "sadness"), "sick": (-0.5, 0.3, "fatigue"),
+}
+
+NEGATIONS = {"not", "no", "never", "hardly", "barely", "without", "nothing", "neither", "nor", "cannot"}
+NEGATION_WINDOW = 3     # tokens after a negation that it still applies to
+NEGATION_SCALE = -0.6   # "not happy" is unhappy, but milder than "sad"
+
+INTENSIFIERS = {
+    "very": 1.4, "really": 1.4, "so": 1.3, "extremely": 1.7, "super": 1.5, "incredibly": 1.6,
+    "totally": 1.4, "completely": 1.5, "too": 1.3, "quite": 1.2, "pretty": 1.1,
+    "slightly": 0.6, "somewhat": 0.7, "kinda": 0.7, "kind": 0.8, "little": 0.7, "bit": 0.7,
+}
+
+TOKEN_PATTERN = re.compile(r"[a-z]+(?:'[a-z]+)?")
+
+LOW_THRESHOLD, HIGH_THRESHOLD = -0.25, 0.25
+
+APOSTROPHES = str.maketrans({"\u2019": "'", "\u2018": "'"})  # phones/browsers insert curly quotes
+
+
+def score_mood(message: str) -> dict:
+    """
+    Returns:
+        valence:  -1 (very negative) .. 1 (very positive), 0 when nothing matched
+        arousal:  0 (calm / drained) .. 1 (agitated / excited)
+        mood:     "low" | "neutral" | "high" — the label the agents already use
+        emotion:  strongest emotion word's category, or None
+        emotions: category of every hit, None for negated ones
+        matched:  number of lexicon hits
+    """
+    tokens = TOKEN_PATTERN.findall(message.lower().translate(APOSTROPHES))
+    valences, arousals, emotions = [], [], []
+    emotion, strongest = None, 0.0
+    negate_left, boost = 0, 1.0
+
+    for token in tokens:
+        if token in NEGATIONS or token.endswith("n't"):
+            negate_left = NEGATION_WINDOW
+            continue
+        if token in INTENSIFIERS:
+            boost *= INTENSIFIERS[token]
+            continue
+
+        entry = LEXICON.get(token)
+        if entry:
+            valence, arousal, category = entry
+            valence *= boost
+            if negate_left:
+                valence *= NEGATION_SCALE
+            valences.append(max(-1.0, min(1.0, valence)))
+            arousals.append(min(1.0, arousal * (boost if boost > 1 else 1.0)))
+            emotions.append(category if not negate_left else None)
+            if abs(valence) > strongest:
+                strongest = abs(valence)
+                emotion = category if not negate_left else None
+
+        boost = 1.0
+        negate_left = max(0, negate_left - 1)
+
+    if not valences:
+        return {"valence": 0.0, "arousal": 0.3, "mood": "neutral", "emotion": None, "emotions": [], "matched": 0}
+
+    valence = sum(valences) / len(valences)
+    arousal = sum(arousals) / len(arousals)
+    if valence <= LOW_THRESHOLD:
+        mood = "low"
+    elif valence >= HIGH_THRESHOLD:
+        mood = "high"
+    else:
+        mood = "neutral"
+
+    return {
+        "valence": round(valence, 3),
+        "arousal": round(arousal, 3),
+        "mood": mood,
+        "emotion": emotion,
+        "emotions": emotions,
+        "matched": len(valences)
+    }
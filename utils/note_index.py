@@ -0,0 +1,175 @@
+# utils/note_index.py
+
+"""
+Local similarity index over past mood-check-in notes.
+
+Notes are embedded with signed feature hashing (word unigrams + bigrams,
+sublinear term frequency, L2-normalised) — no vocabulary to fit and no
+external embedding service. Each note's vector is stored as float16 bytes
+in the `note_vectors` collection; per user, the vectors are held in memory
+as one contiguous NumPy matrix, so a top-k cosine search is a single
+matrix-vector product plus argpartition (a few milliseconds for tens of
+thousands of notes). Inserts append a row in amortised O(1).
+
+Locking: the process-wide lock only guards the LRU; each user's matrix has
+its own lock, and Mongo reads happen outside both — concurrent sessions
+sharing one Orchestrator never queue behind each other's I/O.
+"""
+
+import re
+import threading
+import zlib
+from collections import OrderedDict
+
+import numpy as np
+from pymongo import ASCENDING
+
+
+DIM = 256                # 1 KB per note in memory; 40k notes ≈ 40 MB and a few ms per search
+MIN_SIMILARITY = 0.2     # below this a "similar moment" is just noise
+CACHED_USERS = 512       # per-process LRU of loaded user matrices
+
+TOKEN_PATTERN = re.compile(r"[a-z]+(?:'[a-z]+)?")
+STOPWORDS = {
+    "i", "im", "i'm", "me", "my", "a", "an", "the", "and", "or", "but", "to", "of", "in", "on", "at", "for",
+    "is", "am", "are", "was", "were", "be", "been", "it", "it's", "this", "that", "so", "just", "really",
+    "feel", "feeling", "felt", "today", "bit", "little", "with", "have", "had", "do", "did", "about",
+}
+
+
+def embed(text: str) -> np.ndarray:
+    """Hash a note into a unit-length DIM vector (zero vector if it has no content words)."""
+    words = [w for w in TOKEN_PATTERN.findall(text.lower()) if w not in STOPWORDS]
+    features = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+    vector = np.zeros(DIM, dtype=np.float32)
+    for feature in features:
+        h = zlib.crc32(feature.encode("utf-8"))
+        vector[h % DIM] += 1.0 if h & 0x80000000 else -1.0
+
+    vector = np.sign(vector) * np.log1p(np.abs(vector))
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+class _UserIndex:
+    """One user's vectors: a float32 matrix with spare capacity, plus the matching note metadata."""
+
+    def __init__(self):
+        self.matrix = np.zeros((16, DIM), dtype=np.float32)
+        self.size = 0
+        self.notes = []
+        self.last_ts = ""
+        self.lock = threading.Lock()
+
+    def append(self, vector: np.ndarray, note: dict) -> None:
+        if self.size == len(self.matrix):
+            grown = np.zeros((len(self.matrix) * 2, DIM), dtype=np.float32)
+            grown[:self.size] = self.matrix[:self.size]
+            self.matrix = grown
+        self.matrix[self.size] = vector
+        self.size += 1
+        self.notes.append(note)
+        self.last_ts = max(self.last_ts, note["timestamp"])
+
+
+class NoteIndex:
+    """
+    Usage:
+        index = NoteIndex(mongo)
+        matches = index.search(email, "stressed about exams", k=3)
+        index.add(email, "stressed about exams, a walk helped", timestamp, mood="low")
+    """
+
+    def __init__(self, mongo, cached_users: int = CACHED_USERS):
+        self.vectors = mongo.db["note_vectors"]
+        self.vectors.create_index([("email", ASCENDING), ("timestamp", ASCENDING)])
+        self.cached_users = cached_users
+        self._users = OrderedDict()
+        self._lock = threading.Lock()
+
+    # ---------------- Inserts ---------------- #
+
+    def add(self, email: str, note: str, timestamp: str, mood: str = None) -> None:
+        vector = embed(note)
+        if not vector.any():
+            return
+        meta = {"timestamp": timestamp, "note": note, "mood": mood}
+
+        self.vectors.insert_one({"email": email, **meta, "vector": vector.astype(np.float16).tobytes()})
+        with self._lock:
+            index = self._users.get(email)
+        if index is not None:
+            with index.lock:
+                if timestamp > index.last_ts:  # else a concurrent top-up already has it
+                    index.append(vector, meta)
+
+    # ---------------- Search ---------------- #
+
+    def search(self, email: str, text: str, k: int = 3) -> list:
+        """Top-k most similar past notes: [{"timestamp", "note", "mood", "score"}], best first."""
+        query = embed(text)
+        if not query.any():
+            return []
+
+        index = self._cached(email)
+        self._top_up(email, index)
+
+        with index.lock:
+            if not index.size:
+                return []
+            scores = index.matrix[:index.size] @ query
+            k = min(k, index.size)
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            return [
+                {**index.notes[i], "score": round(float(scores[i]), 3)}
+                for i in top if scores[i] >= MIN_SIMILARITY
+            ]
+
+    def _cached(self, email: str) -> _UserIndex:
+        """LRU bookkeeping only — the one place the process-wide lock is taken."""
+        with self._lock:
+            index = self._users.get(email)
+            if index is None:
+                index = _UserIndex()
+                self._users[email] = index
+                if len(self._users) > self.cached_users:
+                    self._users.popitem(last=False)
+            self._users.move_to_end(email)
+            return index
+
+    def _top_up(self, email: str, index: _UserIndex) -> None:
+        """Append notes stored since the matrix was last updated (e.g. by another process)."""
+        query = {"email": email}
+        if index.last_ts:
+            query["timestamp"] = {"$gt": index.last_ts}
+        docs = list(self.vectors.find(query, sort=[("timestamp", ASCENDING)]))  # no lock held during I/O
+        if not docs:
+            return
+
+        with index.lock:
+            for doc in docs:
+                if doc["timestamp"] <= index.last_ts:
+                    continue  # a concurrent add / top-up got there first
+                vector = np.frombuffer(doc["vector"], dtype=np.float16).astype(np.float32)
+                index.append(vector, {"timestamp": doc["timestamp"], "note": doc["note"], "mood": doc.get("mood")})
+
+    # ---------------- Prompt Context ---------------- #
+
+    @staticmethod
+    def prompt_context(matches: list, token_budget: int = 120) -> str:
+        """Render matches as prompt lines, best first, stopping at ~token_budget tokens (≈4 chars each)."""
+        lines, used = [], 0
+        for match in matches:
+            line = f'- {match["timestamp"][:10]} ({match.get("mood") or "unlabelled"}): "{match["note"]}"'
+            cost = len(line) // 4 + 1
+            if used + cost > token_budget:
+                remaining = (token_budget - used) * 4
+                if remaining < 40:
+                    break
+                line = line[:remaining - 2] + '…"'
+                cost = token_budget - used
+            lines.append(line)
+            used += cost
+        return "\n".join(lines)
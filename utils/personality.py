@@ -1,4 +1,5 @@
 import random
+from utils.tracing import trace_span
 
 FRIENDLY_LINES = [
     "Proud of you for checking in today 🌱",
@@ -8,4 +9,5 @@ FRIENDLY_LINES = [
 ]
 
 def add_warmth(text):
-    return text + "\n\n" + random.choice(FRIENDLY_LINES)
+    with trace_span("personality.add_warmth"):
+        return text + "\n\n" + random.choice(FRIENDLY_LINES)
@@ -0,0 +1,51 @@
+# utils/serve_stats.py
+
+import threading
+
+
+class ServeStats:
+    """
+    Counts how an agent's replies were produced — locally (composer, lexicon,
+    templates) or through the LLM — and estimates the latency saved by
+    serving locally, using the average LLM latency observed so far.
+    Replies shed by the admission controller are counted separately.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.local_count = 0
+        self.local_ms = 0.0
+        self.llm_count = 0
+        self.llm_ms = 0.0
+        self.shed_count = 0
+        self._lock = threading.Lock()
+
+    def record_local(self, elapsed_ms: float) -> None:
+        with self._lock:
+            self.local_count += 1
+            self.local_ms += elapsed_ms
+
+    def record_llm(self, elapsed_ms: float) -> None:
+        with self._lock:
+            self.llm_count += 1
+            self.llm_ms += elapsed_ms
+
+    def record_shed(self) -> None:
+        with self._lock:
+            self.shed_count += 1
+
+    def report(self) -> dict:
+        with self._lock:
+            total = self.local_count + self.llm_count + self.shed_count
+            avg_local = self.local_ms / self.local_count if self.local_count else 0.0
+            avg_llm = self.llm_ms / self.llm_count if self.llm_count else 0.0
+            return {
+                "agent": self.name,
+                "requests": total,
+                "served_locally": self.local_count,
+                "shed": self.shed_count,
+                "local_share": round(self.local_count / total, 4) if total else 0.0,
+                "avg_local_ms": round(avg_local, 3),
+                "avg_llm_ms": round(avg_llm, 1),
+                "latency_saved_ms": round(self.local_count * max(avg_llm - avg_local, 0.0), 1)
+            }
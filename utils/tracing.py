@@ -0,0 +1,275 @@
+# utils/tracing.py
+
+"""
+Lightweight per-request tracing.
+
+- One root span per `Orchestrator.handle` call, child spans for every step.
+- Spans are exported in the Chrome Trace Event format (JSON), which loads
+  directly into Perfetto (ui.perfetto.dev) or chrome://tracing.
+- Root spans are sampled; children follow their root's decision.
+- Optional stack-sampling profiler writes a folded-stack flame graph
+  (flamegraph.pl / speedscope format) for requests slower than a threshold.
+
+Configured through .env:
+    TRACE_EXPORT_PATH      file to append spans to (tracing is off when unset)
+    TRACE_SAMPLE_RATE      share of requests traced, 0.0 - 1.0 (default 1.0)
+    TRACE_PROFILE_SLOW_MS  enable the profiler; keep flame graphs above this
+    TRACE_PROFILE_DIR      where flame graphs go (default "traces/profiles")
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import threading
+import contextvars
+from collections import Counter
+from contextlib import contextmanager
+
+
+_current_span = contextvars.ContextVar("trackr_current_span", default=None)
+
+
+class Span:
+    """A timed unit of work with attributes. Parent/child links come from context."""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "root",
+                 "start_ns", "end_ns", "attributes", "thread_id")
+
+    def __init__(self, name: str, trace_id: str, parent=None, attributes: dict = None):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent.span_id if parent else None
+        self.root = parent.root if parent else self
+        self.attributes = dict(attributes or {})
+        self.thread_id = threading.get_ident()
+        self.start_ns = time.perf_counter_ns()
+        self.end_ns = None
+
+    def set(self, **attributes) -> None:
+        self.attributes.update(attributes)
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.end_ns if self.end_ns is not None else time.perf_counter_ns()
+        return (end - self.start_ns) / 1e6
+
+
+class _NoopSpan:
+    """Returned when a request is not sampled — every call is a cheap no-op."""
+
+    __slots__ = ()
+    root = None
+    duration_ms = 0.0
+
+    def set(self, **attributes) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+# ---------------- Exporters ---------------- #
+
+class ChromeTraceExporter:
+    """
+    Appends spans as Chrome Trace Event "complete" events.
+    The format explicitly allows the closing bracket to be missing,
+    so the file stays valid while the process keeps appending.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._epoch_ns = time.time_ns() - time.perf_counter_ns()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+        self._file = open(path, "a", encoding="utf-8")
+        if new_file:
+            self._file.write("[\n")
+            self._file.flush()
+
+    def export(self, span: Span) -> None:
+        event = {
+            "name": span.name,
+            "cat": "trackr",
+            "ph": "X",
+            "ts": (self._epoch_ns + span.start_ns) // 1000,
+            "dur": max((span.end_ns - span.start_ns) // 1000, 1),
+            "pid": self._pid,
+            "tid": span.thread_id,
+            "args": {
+                "trace_id": span.trace_id,
+                "span_id": span.span_id,
+                "parent_id": span.parent_id,
+                **span.attributes
+            }
+        }
+        line = json.dumps(event, default=str) + ",\n"
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+
+
+class MemoryExporter:
+    """Keeps finished spans in a list — used by the replay tool and for debugging."""
+
+    def __init__(self):
+        self.spans = []
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def drain(self) -> list:
+        with self._lock:
+            spans, self.spans = self.spans, []
+        return spans
+
+
+# ---------------- Profiler Hook ---------------- #
+
+class StackSampler:
+    """
+    Samples one thread's Python stack on a timer while a root span is open.
+    Output is folded stacks ("outer;inner;leaf count"), ready for
+    flamegraph.pl or https://www.speedscope.app.
+    """
+
+    def __init__(self, thread_id: int, interval_s: float = 0.005):
+        self.thread_id = thread_id
+        self.interval_s = interval_s
+        self.samples = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="trackr-stack-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_s):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                frame = frame.f_back
+            if stack:
+                self.samples[";".join(reversed(stack))] += 1
+
+    def write_folded(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+# ---------------- Tracer ---------------- #
+
+class Tracer:
+    def __init__(self, exporter=None, sample_rate: float = 1.0,
+                 profile_slow_ms: float | None = None, profile_dir: str = "traces/profiles"):
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+        self.profile_slow_ms = profile_slow_ms
+        self.profile_dir = profile_dir
+
+    @classmethod
+    def from_env(cls) -> "Tracer":
+        path = os.getenv("TRACE_EXPORT_PATH")
+        slow_ms = os.getenv("TRACE_PROFILE_SLOW_MS")
+        return cls(
+            exporter=ChromeTraceExporter(path) if path else None,
+            sample_rate=float(os.getenv("TRACE_SAMPLE_RATE", "1.0")),
+            profile_slow_ms=float(slow_ms) if slow_ms else None,
+            profile_dir=os.getenv("TRACE_PROFILE_DIR", "traces/profiles")
+        )
+
+    @contextmanager
+    def span(self, name: str, **attributes):
+        parent = _current_span.get()
+
+        if parent is NOOP_SPAN or (parent is None and not self._sample()):
+            token = _current_span.set(NOOP_SPAN)
+            try:
+                yield NOOP_SPAN
+            finally:
+                _current_span.reset(token)
+            return
+
+        trace_id = parent.trace_id if parent else f"{random.getrandbits(128):032x}"
+        span = Span(name, trace_id, parent, attributes)
+        sampler = None
+        if parent is None and self.profile_slow_ms is not None:
+            sampler = StackSampler(span.thread_id).start()
+
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.set(error=type(e).__name__)
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end_ns = time.perf_counter_ns()
+            if sampler:
+                sampler.stop()
+                self._keep_profile(span, sampler)
+            self.exporter.export(span)
+
+    def _sample(self) -> bool:
+        if self.exporter is None:
+            return False
+        return self.sample_rate >= 1.0 or random.random() < self.sample_rate
+
+    def _keep_profile(self, span: Span, sampler: StackSampler) -> None:
+        if span.duration_ms < self.profile_slow_ms or not sampler.samples:
+            return
+        os.makedirs(self.profile_dir, exist_ok=True)
+        path = os.path.join(self.profile_dir, f"{span.trace_id}.folded")
+        sampler.write_folded(path)
+        span.set(profile=path)
+
+
+_tracer = None
+
+
+def get_tracer() -> Tracer:
+    global _tracer
+    if _tracer is None:
+        _tracer = Tracer.from_env()
+    return _tracer
+
+
+def set_tracer(tracer: Tracer) -> None:
+    global _tracer
+    _tracer = tracer
+
+
+def trace_span(name: str, **attributes):
+    """Context manager: `with trace_span("memory.get_user") as span: ...`"""
+    return get_tracer().span(name, **attributes)
+
+
+def current_span():
+    span = _current_span.get()
+    return span if span is not None else NOOP_SPAN
+
+
+def annotate_root(**attributes) -> None:
+    """Tag the request's root span (agent, fallback used, ...) from anywhere below it."""
+    root = current_span().root
+    if root is not None:
+        root.set(**attributes)
@@ -0,0 +1,247 @@
+# utils/workout_composer.py
+
+"""
+Local workout composer.
+
+Most workout requests only differ in minutes, fitness level and equipment.
+This module holds an indexed exercise library and composes a plan for those
+constraints in well under a millisecond, preferring exercises the user has
+not done in their recent workouts. Requests it cannot interpret are left to
+the LLM (parse_request returns None).
+"""
+
+import random
+import re
+from collections import Counter, namedtuple
+
+
+LEVELS = ["beginner", "intermediate", "advanced"]
+
+Exercise = namedtuple("Exercise", "name category min_level max_level equipment kind")
+
+# ---------------- Exercise Library ---------------- #
+# kind: "reps" → sets x reps, "timed" → sets x seconds, "flow" → minutes (warm-up / cool-down)
+
+EXERCISES = [
+    # Warm-up
+    Exercise("March in place", "warmup", 0, 2, None, "flow"),
+    Exercise("Arm circles", "warmup", 0, 2, None, "flow"),
+    Exercise("Hip circles", "warmup", 0, 2, None, "flow"),
+    Exercise("Easy jumping jacks", "warmup", 1, 2, None, "flow"),
+    Exercise("Light rope skipping", "warmup", 1, 2, "jump rope", "flow"),
+
+    # Lower body
+    Exercise("Bodyweight squats", "lower", 0, 2, None, "reps"),
+    Exercise("Glute bridges", "lower", 0, 2, None, "reps"),
+    Exercise("Reverse lunges", "lower", 0, 2, None, "reps"),
+    Exercise("Wall sit", "lower", 0, 1, None, "timed"),
+    Exercise("Calf raises", "lower", 0, 2, None, "reps"),
+    Exercise("Jump squats", "lower", 1, 2, None, "reps"),
+    Exercise("Bulgarian split squats", "lower", 2, 2, None, "reps"),
+    Exercise("Goblet squats", "lower", 0, 2, "dumbbells", "reps"),
+    Exercise("Dumbbell Romanian deadlifts", "lower", 1, 2, "dumbbells", "reps"),
+    Exercise("Kettlebell swings", "lower", 1, 2, "kettlebell", "reps"),
+    Exercise("Banded lateral walks", "lower", 0, 2, "resistance band", "reps"),
+
+    # Upper body
+    Exercise("Wall push-ups", "upper", 0, 0, None, "reps"),
+    Exercise("Knee push-ups", "upper", 0, 1, None, "reps"),
+    Exercise("Push-ups", "upper", 1, 2, None, "reps"),
+    Exercise("Chair triceps dips", "upper", 0, 2, None, "reps"),
+    Exercise("Pike push-ups", "upper", 2, 2, None, "reps"),
+    Exercise("Superman pulls", "upper", 0, 2, None, "reps"),
+    Exercise("Dumbbell rows", "upper", 0, 2, "dumbbells", "reps"),
+    Exercise("Dumbbell shoulder press", "upper", 0, 2, "dumbbells", "reps"),
+    Exercise("Band pull-aparts", "upper", 0, 2, "resistance band", "reps"),
+    Exercise("Banded rows", "upper", 0, 2, "resistance band", "reps"),
+
+    # Core
+    Exercise("Plank", "core", 0, 2, None, "timed"),
+    Exercise("Dead bugs", "core", 0, 2, None, "reps"),
+    Exercise("Bird dogs", "core", 0, 1, None, "reps"),
+    Exercise("Side plank", "core", 1, 2, None, "timed"),
+    Exercise("Bicycle crunches", "core", 1, 2, None, "reps"),
+    Exercise("Hollow body hold", "core", 2, 2, None, "timed"),
+    Exercise("Dumbbell Russian twists", "core", 1, 2, "dumbbells", "reps"),
+
+    # Cardio
+    Exercise("Step jacks", "cardio", 0, 0, None, "timed"),
+    Exercise("Jumping jacks", "cardio", 0, 2, None, "timed"),
+    Exercise("High knees", "cardio", 0, 2, None, "timed"),
+    Exercise("Skaters", "cardio", 1, 2, None, "timed"),
+    Exercise("Mountain climbers", "cardio", 1, 2, None, "timed"),
+    Exercise("Burpees", "cardio", 2, 2, None, "timed"),
+    Exercise("Rope skipping", "cardio", 0, 2, "jump rope", "timed"),
+
+    # Cool-down
+    Exercise("Standing hamstring stretch", "cooldown", 0, 2, None, "flow"),
+    Exercise("Quad stretch", "cooldown", 0, 2, None, "flow"),
+    Exercise("Child's pose", "cooldown", 0, 2, None, "flow"),
+    Exercise("Chest opener stretch", "cooldown", 0, 2, None, "flow"),
+    Exercise("Slow deep breathing", "cooldown", 0, 2, None, "flow"),
+]
+
+# (category, level index) → exercises, built once at import.
+INDEX = {}
+for _exercise in EXERCISES:
+    for _level in range(_exercise.min_level, _exercise.max_level + 1):
+        INDEX.setdefault((_exercise.category, _level), []).append(_exercise)
+
+DOSES = {
+    "reps": ["2 x 8", "3 x 12", "4 x 15"],
+    "timed": ["3 x 20 seconds", "3 x 40 seconds", "4 x 45 seconds"],
+}
+
+EQUIPMENT_ALIASES = {
+    "dumbbell": "dumbbells", "dumbbells": "dumbbells",
+    "band": "resistance band", "bands": "resistance band",
+    "resistance band": "resistance band", "resistance bands": "resistance band",
+    "kettlebell": "kettlebell", "kettlebells": "kettlebell",
+    "jump rope": "jump rope", "skipping rope": "jump rope", "rope": "jump rope",
+}
+
+# ---------------- Request Parsing ---------------- #
+
+FOCUS_WORDS = {
+    "full": "full", "body": "full", "total": "full",
+    "leg": "lower", "legs": "lower", "lower": "lower", "glutes": "lower", "squats": "lower",
+    "arm": "upper", "arms": "upper", "upper": "upper", "chest": "upper", "back": "upper",
+    "shoulders": "upper", "pushups": "upper", "push-ups": "upper",
+    "core": "core", "abs": "core",
+    "cardio": "cardio", "hiit": "cardio", "sweat": "cardio",
+}
+
+INTENSITY_WORDS = {
+    "easy": -1, "gentle": -1, "light": -1, "low-impact": -1,
+    "hard": 1, "intense": 1, "challenging": 1, "tough": 1,
+}
+
+FILLER_WORDS = {
+    "a", "an", "the", "me", "my", "i", "i'm", "im", "to", "for", "of", "with", "and", "in", "on", "at",
+    "please", "can", "could", "you", "give", "get", "want", "need", "would", "like", "some", "do", "let's",
+    "lets", "make", "create", "build", "suggest", "plan", "new", "today", "now", "quick", "short",
+    "workout", "workouts", "exercise", "exercises", "routine", "session", "training", "gym", "home",
+    "minute", "minutes", "min", "mins", "only", "have", "got", "something", "time", "another", "again",
+}
+
+PATTERNS = {
+    "full": ["lower", "upper", "core", "cardio", "lower", "upper"],
+    "lower": ["lower", "lower", "core", "lower", "cardio", "lower"],
+    "upper": ["upper", "upper", "core", "upper", "cardio", "upper"],
+    "core": ["core", "core", "lower", "core", "cardio", "core"],
+    "cardio": ["cardio", "cardio", "lower", "cardio", "core", "cardio"],
+}
+
+TITLES = {
+    "full": "Full-Body Circuit",
+    "lower": "Lower-Body Strength",
+    "upper": "Upper-Body Strength",
+    "core": "Core Builder",
+    "cardio": "Cardio Burst",
+}
+
+TIPS = [
+    "Move at a comfortable pace. Hydrate and take pauses if needed.",
+    "Keep the form smooth and controlled — quality over speed.",
+    "Breathe out on the effort and keep your core lightly braced.",
+]
+
+MIN_MINUTES, MAX_MINUTES = 5, 90
+BLOCK_MINUTES = 3
+MAX_CIRCUIT = 6
+
+
+def parse_request(message: str) -> dict | None:
+    """
+    Interpret a workout request as {"focus", "level_shift"}.
+    Returns None for free-form requests (yoga, injuries, specific sports...)
+    that the library can't honour — those go to the LLM.
+    """
+    focus, shift, mixed = "full", 0, False
+    for word in re.findall(r"[a-z][a-z'-]*", message.lower()):
+        if word in FILLER_WORDS:
+            continue
+        if word in FOCUS_WORDS:
+            target = FOCUS_WORDS[word]
+            if target != "full":
+                # Two different body areas ("legs and arms") → full body
+                focus = target if focus in ("full", target) and not mixed else "full"
+                mixed = mixed or focus == "full"
+        elif word in INTENSITY_WORDS:
+            shift = INTENSITY_WORDS[word]
+        else:
+            return None
+    return {"focus": focus, "level_shift": shift}
+
+
+def normalize_equipment(equipment: list) -> set:
+    return {EQUIPMENT_ALIASES[e.strip().lower()] for e in equipment or [] if e.strip().lower() in EQUIPMENT_ALIASES}
+
+
+# ---------------- Composer ---------------- #
+
+def compose(minutes: int, fitness_level: str, equipment: list, request: dict,
+            recent_exercises: list = (), seed=None) -> dict | None:
+    """
+    Build a plan in the same JSON shape the LLM returns, plus an "exercises"
+    list (names used) so later plans can vary against it.
+    Returns None when the constraints are outside what the library covers.
+    """
+    if not MIN_MINUTES <= minutes <= MAX_MINUTES:
+        return None
+
+    base_level = LEVELS.index(fitness_level) if fitness_level in LEVELS else 0
+    level = min(max(base_level + request.get("level_shift", 0), 0), len(LEVELS) - 1)
+    focus = request.get("focus", "full")
+    owned = normalize_equipment(equipment)
+    recent = Counter(recent_exercises)
+    rng = random.Random(seed)
+    used = set()
+
+    def pick(category):
+        candidates = [
+            e for e in INDEX.get((category, level), [])
+            if e.name not in used and (e.equipment is None or e.equipment in owned)
+        ]
+        if not candidates:
+            return None
+        choice = min(candidates, key=lambda e: (recent[e.name], rng.random() - (0.3 if e.equipment else 0.0)))
+        used.add(choice.name)
+        return choice
+
+    warm = max(2, round(minutes * 0.15))
+    cool = max(2, round(minutes * 0.15))
+    blocks = max(1, (minutes - warm - cool) // BLOCK_MINUTES)
+    circuit_size = min(blocks, MAX_CIRCUIT)
+    rounds = max(1, round(blocks / circuit_size))
+
+    steps = _flow_steps("Warm-up", [pick("warmup") for _ in range(2 if warm >= 3 else 1)], warm)
+
+    circuit = [e for e in (pick(c) for c in PATTERNS[focus][:circuit_size]) if e]
+    for exercise in circuit:
+        steps.append(f"{DOSES[exercise.kind][level]} {exercise.name.lower()}")
+    if rounds > 1:
+        steps.append(f"Rest 1 minute, repeat the circuit {rounds} times in total")
+
+    steps.extend(_flow_steps("Finish", [pick("cooldown") for _ in range(2 if cool >= 3 else 1)], cool))
+
+    return {
+        "workout_name": TITLES[focus],
+        "duration": f"{minutes} minutes",
+        "intensity": LEVELS[level],
+        "steps": steps,
+        "tips": TIPS[rng.randrange(len(TIPS))],
+        "exercises": sorted(used)
+    }
+
+
+def _flow_steps(label: str, exercises: list, total_minutes: int) -> list:
+    exercises = [e for e in exercises if e]
+    if not exercises:
+        return []
+    share = [total_minutes // len(exercises)] * len(exercises)
+    share[0] += total_minutes - sum(share)
+    return [
+        f"{label}: {e.name.lower()} — {m} minute{'s' if m != 1 else ''}"
+        for e, m in zip(exercises, share)
+    ]
@@ -0,0 +1,191 @@
+# web_app.py
+
+"""
+Web chat front end for Trackr AI (Gradio).
+
+One process serves many browser sessions at once. Every session shares a
+single Orchestrator — and with it one Mongo connection pool and one
+GeminiClient — while each session keeps its own login state in gr.State.
+
+- Login: email → OTP through the Orchestrator's AuthService, which limits
+  codes per address and discards a code after repeated wrong guesses; each
+  browser session is also capped on sends and attempts
+- Concurrency: at most WEB_CONCURRENCY_LIMIT messages are handled at once;
+  the rest wait in Gradio's queue (up to WEB_QUEUE_SIZE, then rejected)
+- Ordering: messages from the same user are handled one at a time, even
+  across browser tabs, so onboarding steps and log appends stay in order
+- Streaming: the reply is shown as soon as the agent returns, line by line
+
+Run with:
+    python web_app.py [--port 7860] [--stand-ins]
+
+--stand-ins wires the in-memory Mongo, fake Gemini and a fixed OTP (000000)
+for local development and load tests (tools/web_load.py).
+"""
+
+import argparse
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+
+import gradio as gr
+
+
+STREAM_DELAY_S = 0.01       # pause between streamed lines
+MAX_SESSION_SENDS = 5       # login codes one browser session may request
+MAX_SESSION_ATTEMPTS = 10   # codes one browser session may try
+
+
+def format_reply(reply: dict) -> str:
+    """Orchestrator reply → chat text (agents put their UI text in data["display"])."""
+    if reply.get("agent") == "system":
+        return reply.get("message", "")
+    data = reply.get("data") or {}
+    return data.get("display") or str(data)
+
+
+class ChatFrontend:
+    def __init__(self, orch, concurrency_limit: int = 16):
+        self.orch = orch
+        self.concurrency_limit = concurrency_limit
+        # Orchestrator calls block (Mongo, Gemini) — run them off the event loop
+        self._executor = ThreadPoolExecutor(max_workers=concurrency_limit, thread_name_prefix="trackr-web")
+        self._user_locks = {}  # email → [lock, holders + waiters]; dropped when nobody needs it
+
+    async def _run(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    @asynccontextmanager
+    async def _user_lock(self, email: str):
+        """One message at a time per user. Only touched from the event loop, so the count needs no lock."""
+        entry = self._user_locks.setdefault(email, [asyncio.Lock(), 0])
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                yield
+        finally:
+            entry[1] -= 1
+            if not entry[1]:
+                del self._user_locks[email]
+
+    # ---------------- Login ---------------- #
+
+    async def send_code(self, email: str, session: dict):
+        email = (email or "").strip().lower()
+        if "@" not in email:
+            return session, "Please enter a valid email address."
+        if session.get("sends", 0) >= MAX_SESSION_SENDS:
+            return session, "❌ Too many codes requested — please reload the page and try again later."
+
+        session = {**session, "sends": session.get("sends", 0) + 1}
+        if not await self._run(self.orch.auth.start_login, email):
+            return session, "❌ The code could not be sent — please wait a few minutes and try again."
+        return {**session, "pending_email": email}, f"📧 Code sent to {email} — check your inbox."
+
+    async def verify(self, code: str, session: dict):
+        email = session.get("pending_email")
+        if not email:
+            return session, "Send a code to your email first.", gr.update(), gr.update(), []
+        if session.get("attempts", 0) >= MAX_SESSION_ATTEMPTS:
+            return session, "❌ Too many attempts — please reload the page and try again later.", \
+                gr.update(), gr.update(), []
+
+        session = {**session, "attempts": session.get("attempts", 0) + 1}
+        if not await self._run(self.orch.auth.verify, email, (code or "").strip()):
+            if not await self._run(self.orch.auth.has_pending, email):
+                session["pending_email"] = None
+                return session, "❌ That code is no longer valid — request a new one.", gr.update(), gr.update(), []
+            return session, "❌ Incorrect code — try again.", gr.update(), gr.update(), []
+
+        user = await self._run(self.orch.memory.get_user, email)
+        if user.get("onboarding_status", {}).get("completed"):
+            greeting = f"Welcome back, {user['profile'].get('name') or 'friend'} 💛 How can I help today?"
+        else:
+            greeting = "🎉 Login successful! Let's get started 😊 What's your name?"
+
+        session = {**session, "email": email, "pending_email": None}
+        history = [{"role": "assistant", "content": greeting}]
+        return session, "", gr.update(visible=False), gr.update(visible=True), history
+
+    # ---------------- Chat ---------------- #
+
+    async def respond(self, message: str, history: list, session: dict):
+        email = session.get("email")
+        message = (message or "").strip()
+        if not email or not message:
+            yield history, ""
+            return
+
+        history = history + [{"role": "user", "content": message}, {"role": "assistant", "content": "…"}]
+        yield history, ""
+
+        async with self._user_lock(email):
+            try:
+                reply = await self._run(self.orch.handle, email, message)
+                text = format_reply(reply)
+            except Exception as e:
+                print(f"⚠️ Web request failed for {email}: {e}")
+                text = "Something went wrong on our side — please try again in a moment 🙏"
+
+        shown = []
+        for line in text.split("\n"):
+            shown.append(line)
+            history[-1] = {"role": "assistant", "content": "\n".join(shown)}
+            yield history, ""
+            await asyncio.sleep(STREAM_DELAY_S)
+
+    # ---------------- Layout ---------------- #
+
+    def build(self, queue_size: int = 256) -> gr.Blocks:
+        with gr.Blocks(title="Trackr AI") as demo:
+            session = gr.State({"email": None, "pending_email": None, "sends": 0, "attempts": 0})
+            gr.Markdown("# ✨ Trackr AI — your wellbeing companion")
+
+            with gr.Column(visible=True) as login:
+                email = gr.Textbox(label="📧 Email", placeholder="you@example.com")
+                send = gr.Button("Send login code")
+                code = gr.Textbox(label="🔐 Code", placeholder="6-digit code")
+                verify = gr.Button("Log in", variant="primary")
+                status = gr.Markdown()
+
+            with gr.Column(visible=False) as chat:
+                chatbot = gr.Chatbot(height=520)
+                message = gr.Textbox(placeholder="“I ate pasta” · “Give me a 20 minute workout” · “I feel stressed”",
+                                     show_label=False)
+
+            send.click(self.send_code, [email, session], [session, status], api_name="send_code")
+            verify.click(self.verify, [code, session], [session, status, login, chat, chatbot], api_name="verify")
+            message.submit(self.respond, [message, chatbot, session], [chatbot, message], api_name="respond",
+                           concurrency_limit=self.concurrency_limit)
+
+        demo.queue(max_size=queue_size, default_concurrency_limit=self.concurrency_limit)
+        return demo
+
+
+def build_orchestrator(stand_ins: bool = False, llm_latency_ms: float = 800):
+    if stand_ins:
+        from tools.replay import make_orchestrator
+        return make_orchestrator("memory", llm_latency_ms=llm_latency_ms)
+    from main import Orchestrator
+    return Orchestrator()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the Trackr AI web chat.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7860)
+    parser.add_argument("--stand-ins", action="store_true", help="in-memory Mongo, fake Gemini, OTP 000000")
+    parser.add_argument("--llm-latency-ms", type=float, default=800, help="fake Gemini latency (with --stand-ins)")
+    args = parser.parse_args()
+
+    frontend = ChatFrontend(
+        build_orchestrator(args.stand_ins, args.llm_latency_ms),
+        concurrency_limit=int(os.getenv("WEB_CONCURRENCY_LIMIT", "16"))
+    )
+    demo = frontend.build(queue_size=int(os.getenv("WEB_QUEUE_SIZE", "256")))
+    demo.launch(server_name=args.host, server_port=args.port)
+
+
+if __name__ == "__main__":
+    main()